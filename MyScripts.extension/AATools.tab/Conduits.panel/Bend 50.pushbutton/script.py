@@ -1,85 +1,83 @@
 # -*- coding: utf-8 -*-
 """
 Changes the radius of pre-selected bend fittings to 50 inches.
+With nothing selected, normalizes every conduit bend in the model using
+the size/angle rules in 'bend_radius_rules.json'.
 """
 
 __title__ = "Bend 50\""
 __author__ = "Your Name"
 
-from Autodesk.Revit.DB import Transaction, BuiltInParameter
+from aatools import instrument
+instrument.start('Bend 50')
+
 from pyrevit import revit, forms
 
+from aatools import transactions
+from aatools.bend_radius import set_radius
+
 doc = revit.doc
 
-def find_and_set_radius(element, radius_value):
-    radius_param = None
-
-    param_builtin = element.get_Parameter(BuiltInParameter.RBS_CONDUIT_BENDRADIUS)
-    if param_builtin and not param_builtin.IsReadOnly:
-        radius_param = param_builtin
-    else:
-        for param_name in ["Radius", "Nominal Radius", "Bend Radius"]:
-            p = element.LookupParameter(param_name)
-            if p and not p.IsReadOnly:
-                radius_param = p
-                break
-
-    if radius_param:
-        try:
-            radius_param.Set(radius_value)
-            return True
-        except Exception:
-            pass
+def normalize_model_bends():
+    # Only needed without a selection; keeps the common click light.
+    from aatools import bend_rules
+
+    try:
+        rule_table = bend_rules.load_rules()
+    except Exception as e:
+        forms.alert("Could not read the bend radius rules.\nError: {}".format(e), exitscript=True)
+
+    instrument.ready()
+    if not forms.alert("Nothing is selected.\n\n"
+                       "Normalize the radius of every conduit bend in the model "
+                       "using the bend radius rules?", yes=True, no=True):
+        return
 
     try:
-        elem_type = doc.GetElement(element.GetTypeId())
-        if elem_type:
-            type_param = None
-            type_param_builtin = elem_type.get_Parameter(BuiltInParameter.RBS_CONDUIT_BENDRADIUS)
-            if type_param_builtin and not type_param_builtin.IsReadOnly:
-                type_param = type_param_builtin
-            else:
-                for param_name in ["Radius", "Nominal Radius", "Bend Radius"]:
-                    p = elem_type.LookupParameter(param_name)
-                    if p and not p.IsReadOnly:
-                        type_param = p
-                        break
-            
-            if type_param:
-                type_param.Set(radius_value)
-                return True
-    except Exception:
-        return False
-        
-    return False
+        with instrument.phase('transaction'):
+            with transactions.transaction(doc, 'Normalize Conduit Bend Radii'):
+                result, unmatched = bend_rules.normalize_model(doc, rule_table)
+
+                if result.modified_count > 0:
+                    with instrument.phase('regenerate'):
+                        doc.Regenerate()
+
+    except Exception as e:
+        forms.alert("An error occurred: {}\nNo changes were made.".format(e), exitscript=True)
+
+    forms.alert("{}\nNo matching rule: {}".format(result.summary(), unmatched),
+                title="Bend Radii Normalized")
 
 def change_bend_radius_silently():
 
     selection = revit.get_selection()
 
     if not selection:
-        forms.alert("Please select one or more bend fittings first.", exitscript=True)
+        normalize_model_bends()
+        instrument.finish()
+        return
 
     new_radius_feet = 50.0 / 12.0
-    changed_count = 0
-
-    t = Transaction(doc, 'Change Bend Radius to 50" (Silent)')
-    t.Start()
 
     try:
-        for el in selection:
-            if find_and_set_radius(el, new_radius_feet):
-                changed_count += 1
+        with instrument.phase('transaction'):
+            with transactions.transaction(doc, 'Change Bend Radius to 50" (Silent)'):
+                with instrument.phase('set radius', len(selection)):
+                    result = set_radius(doc, selection, new_radius_feet)
 
-        if changed_count > 0:
-            doc.Regenerate()
-
-        t.Commit()
+                if result.modified_count > 0:
+                    with instrument.phase('regenerate'):
+                        doc.Regenerate()
 
     except Exception as e:
-        if t.HasStarted():
-            t.RollBack()
         forms.alert("An error occurred: {}\nNo changes were made.".format(e), exitscript=True)
 
+    # Stay silent unless a radius could not be written; selected conduits and
+    # other elements without a radius are simply left alone.
+    if result.failed:
+        forms.alert(result.summary(), title="Some Bends Were Not Changed")
+
+    instrument.finish()
+
 if __name__ == "__main__":
     change_bend_radius_silently()
\ No newline at end of file
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#pylint: disable=E0401,W0703,C0103
+"""
+CONDUIT QUANTITIES
+Lists conduit length and count per type and size, and conduit fitting
+counts per type and size with their bend radii. The result is cached for
+the session; later runs only re-read the elements changed since.
+Shift-click to rescan the whole model.
+"""
+
+from aatools import instrument
+instrument.start('Quantities')
+
+from pyrevit import script
+from pyrevit import revit
+from pyrevit import EXEC_PARAMS
+
+from aatools import conduit_report
+
+doc = revit.doc
+
+# --- Step 1: Collect or refresh the quantities ---
+state, mode = conduit_report.get_report(doc, refresh=not EXEC_PARAMS.config_mode)
+conduit_rows, fitting_rows = conduit_report.report_rows(doc, state)
+
+# --- Step 2: Print the report ---
+output = script.get_output()
+output.print_md('## Conduit Quantities - {}'.format(doc.Title))
+output.print_md({
+    conduit_report.FULL: 'Whole model scanned.',
+    conduit_report.INCREMENTAL: 'Updated from the elements changed since the last report.',
+    conduit_report.CACHED: 'No conduit changes since the last report.',
+}[mode])
+
+if not conduit_rows and not fitting_rows:
+    output.print_md('No conduits or conduit fittings found.')
+
+if conduit_rows:
+    output.print_table(
+        table_data=[[name, size, count, '{:.2f}'.format(length)]
+                    for name, size, count, length in conduit_rows],
+        columns=['Conduit Type', 'Size', 'Count', 'Length (ft)'],
+        title='Conduits'
+    )
+
+if fitting_rows:
+    def format_bends(bends):
+        return ', '.join('{:g}" x {}'.format(radius, count)
+                         for radius, count in sorted(bends.items())) or '-'
+
+    output.print_table(
+        table_data=[[name, size, count, format_bends(bends)]
+                    for name, size, count, bends in fitting_rows],
+        columns=['Fitting Type', 'Size', 'Count', 'Bends per Radius'],
+        title='Conduit Fittings'
+    )
+
+instrument.finish()
@@ -2,37 +2,72 @@
 #pylint: disable=E0401,W0703,C0103
 """
 BUTTON 2: APPLY REMEMBERED TYPES
-This script retrieves the stored Conduit and Fitting type IDs,
-and applies them to the user's current selection.
+This script retrieves the stored Conduit and Fitting type presets,
+lets the user pick one when several exist, and applies it to the
+user's current selection.
 """
 
-from Autodesk.Revit.DB import ElementId, Transaction
+from aatools import instrument
+instrument.start('Types Apply')
+
+from Autodesk.Revit.DB import ElementId, BuiltInCategory
 from pyrevit import forms
 from pyrevit import script
 from pyrevit import revit
 
-# --- Unique Keys for Retrieving Data ---
-CONDUIT_ID_KEY = 'MyConduitChanger_ConduitTypeID'
-FITTING_ID_KEY = 'MyConduitChanger_FittingTypeID'
+from aatools import conduit_types, transactions
 
 doc = revit.doc
 
-# --- Step 1: Load the stored ElementIDs ---
-conduit_type_id_int = script.load_data(CONDUIT_ID_KEY)
-fitting_type_id_int = script.load_data(FITTING_ID_KEY)
+# --- Step 1: Load the stored presets ---
+presets = conduit_types.load_presets()
+target_conduit_type_id = None
+target_fitting_type_id = None
+
+if presets:
+    # --- Step 2: Pick a preset (last used one first) ---
+    active_name = conduit_types.load_active_preset()
+    preset_names = sorted(presets.keys())
+    if active_name in presets:
+        preset_names.remove(active_name)
+        preset_names.insert(0, active_name)
 
-# --- Step 2: Check if the types have been set ---
-if not conduit_type_id_int or not fitting_type_id_int:
-    forms.alert(
-        "Target types have not been set yet.\n\n"
-        "Please run the 'Set Conduit Types' script first.",
-        title="Error: Types Not Set",
-        exitscript=True
-    )
+    if len(preset_names) == 1:
+        selected_preset = preset_names[0]
+    else:
+        instrument.ready()
+        selected_preset = forms.SelectFromList.show(
+            preset_names,
+            title='Select Conduit Type Preset',
+            button_name='Apply Preset'
+        )
+        if not selected_preset:
+            script.exit()
 
-# Convert the stored integers back into ElementId objects
-target_conduit_type_id = ElementId(conduit_type_id_int)
-target_fitting_type_id = ElementId(fitting_type_id_int)
+    conduit_types.save_active_preset(selected_preset)
+    target_conduit_type_id, target_fitting_type_id = conduit_types.resolve_preset(
+        doc, presets[selected_preset])
+
+    if target_conduit_type_id is None or target_fitting_type_id is None:
+        forms.alert(
+            "The types of preset '{}' do not exist in this model.\n\n"
+            "Please run the 'Set Conduit Types' script again.".format(selected_preset),
+            title="Error: Types Not Found",
+            exitscript=True
+        )
+else:
+    # --- Step 2: Fall back to the pair stored by older versions ---
+    legacy_pair = conduit_types.load_legacy_pair()
+    if not legacy_pair:
+        forms.alert(
+            "Target types have not been set yet.\n\n"
+            "Please run the 'Set Conduit Types' script first.",
+            title="Error: Types Not Set",
+            exitscript=True
+        )
+    # Convert the stored integers back into ElementId objects
+    target_conduit_type_id = ElementId(legacy_pair[0])
+    target_fitting_type_id = ElementId(legacy_pair[1])
 
 # --- Step 3: Get selection and apply the types ---
 selection = revit.get_selection()
@@ -40,17 +75,30 @@ selection = revit.get_selection()
 if selection.is_empty:
     forms.alert("No elements are selected. Please select conduits and fittings to change.", exitscript=True)
 
-with revit.Transaction('Apply Stored Conduit and Fitting Types'):
-    for element in selection:
-        if not hasattr(element, 'Category') or not element.Category:
-            continue
-        
-        # Check if it's a Conduit
-        if element.Category.Id == doc.Settings.Categories.get_Item("Conduits").Id:
-            if element.GetTypeId() != target_conduit_type_id:
-                element.ChangeTypeId(target_conduit_type_id)
-        
-        # Check if it's a Conduit Fitting
-        elif element.Category.Id == doc.Settings.Categories.get_Item("Conduit Fittings").Id:
-            if element.GetTypeId() != target_fitting_type_id:
-                element.ChangeTypeId(target_fitting_type_id)
+conduit_cat_id = int(BuiltInCategory.OST_Conduit)
+fitting_cat_id = int(BuiltInCategory.OST_ConduitFitting)
+
+def apply_type(element):
+    if not hasattr(element, 'Category') or not element.Category:
+        return transactions.SKIPPED
+    category_id = element.Category.Id.IntegerValue
+
+    # Check if it's a Conduit
+    if category_id == conduit_cat_id:
+        target_type_id = target_conduit_type_id
+    # Check if it's a Conduit Fitting
+    elif category_id == fitting_cat_id:
+        target_type_id = target_fitting_type_id
+    else:
+        return transactions.SKIPPED
+
+    if element.GetTypeId() == target_type_id:
+        return transactions.SKIPPED
+    instrument.counted(element.ChangeTypeId, 'ChangeTypeId')(target_type_id)
+
+with instrument.phase('change types', len(selection)):
+    log = transactions.run_items(doc, 'Apply Stored Conduit and Fitting Types', selection, apply_type)
+
+if log.failed:
+    forms.alert(log.summary(), title="Some Types Were Not Changed")
+instrument.finish()
@@ -7,9 +7,6 @@ And then place in it copy of the room (with all corresponding to it parameters).
 __title__ = "Copy Rooms"
 __author__ = "AA"
 
-# --- .NET Imports ---
-from System.Collections.Generic import List as DotNetList
-
 # --- Revit API Imports ---
 from Autodesk.Revit.DB import (
     FilteredElementCollector,
@@ -21,7 +18,6 @@ from Autodesk.Revit.DB import (
     SketchPlane,
     XYZ,
     Transform,
-    ElementId,
     UV,
     StorageType,
     LocationPoint,
@@ -33,6 +29,8 @@ from Autodesk.Revit.DB.Architecture import Room
 from pyrevit import forms
 from pyrevit import revit
 
+from aatools import creation_ledger
+
 # --- Globals ---
 doc = revit.doc
 uidoc = revit.uidoc
@@ -112,7 +110,7 @@ def main():
     if offset_y is None: return
 
     # 2. Main Logic
-    newly_created_element_ids = []
+    ledger = creation_ledger.CreationLedger(__title__, doc, active_view)
     with Transaction(doc, "Create Offset Rooms and Separators") as t:
         t.Start()
 
@@ -123,6 +121,7 @@ def main():
             return
 
         sketch_plane = SketchPlane.Create(doc, level.Id)
+        ledger.record(sketch_plane.Id, creation_ledger.SKETCH_PLANE)
 
         for room in visible_rooms:
             if not isinstance(room.Location, LocationPoint):
@@ -145,7 +144,7 @@ def main():
             if not final_curves_for_room.IsEmpty:
                 separators = doc.Create.NewRoomBoundaryLines(sketch_plane, final_curves_for_room, active_view)
                 for sep in separators:
-                    newly_created_element_ids.append(sep.Id)
+                    ledger.record(sep.Id, creation_ledger.SEPARATOR, room.Id.IntegerValue)
             
             original_loc_point = room.Location.Point
             new_loc_point = transform.OfPoint(original_loc_point)
@@ -154,7 +153,7 @@ def main():
             new_room = doc.Create.NewRoom(level, uv_point)
 
             if new_room:
-                newly_created_element_ids.append(new_room.Id)
+                ledger.record(new_room.Id, creation_ledger.ROOM, room.Id.IntegerValue)
                 for param in room.Parameters:
                     if not param.IsReadOnly and param.HasValue:
                         new_param = new_room.get_Parameter(param.Definition)
@@ -174,26 +173,15 @@ def main():
         t.Commit()
 
     # 3. Post-processing and User Feedback
-    if newly_created_element_ids:
-        # Convert Python list to a .NET collection for the API method
-        selection_collection = DotNetList[ElementId](newly_created_element_ids)
-        uidoc.Selection.SetElementIds(selection_collection)
-        
-        # --- Refactored this section for clarity ---
-        # Get the IDs of the newly created separator lines
-        separator_ids = [
-            eid for eid in newly_created_element_ids 
-            if doc.GetElement(eid).Category.Id.IntegerValue != int(BuiltInCategory.OST_Rooms)
-        ]
-        
-        # Get the IDs of the newly created rooms
-        room_ids = [
-            eid for eid in newly_created_element_ids 
-            if doc.GetElement(eid).Category.Id.IntegerValue == int(BuiltInCategory.OST_Rooms)
-        ]
-
-        total_separators = len(separator_ids)
-        total_rooms = len(room_ids)
+    # The ledger always holds the sketch plane; only report when rooms or separators were created.
+    if ledger.ids(creation_ledger.ROOM, creation_ledger.SEPARATOR):
+        creation_ledger.select(uidoc, ledger, creation_ledger.ROOM, creation_ledger.SEPARATOR)
+        creation_ledger.remember(doc, ledger)
+
+        # The ledger already knows what each new element is
+        counts = ledger.counts()
+        total_separators = counts.get(creation_ledger.SEPARATOR, 0)
+        total_rooms = counts.get(creation_ledger.ROOM, 0)
         
         # Create the message string first
         message = "Successfully created {} Room Separator lines and {} new rooms.".format(
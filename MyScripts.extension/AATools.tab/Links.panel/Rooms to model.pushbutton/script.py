@@ -1,19 +1,22 @@
 # -*- coding: utf-8 -*-
 """
 pyRevit script to generate 'Room Separator' lines based on the boundaries of existing rooms AND existing separators visible in the view.
+Shift-click to export the view's boundary snapshot for the batch planner (aatools.room_batch), to replay a plan file,
+or to select, export or delete what a run created (undo manifest).
 """
 
 __title__ = "Copy Rooms"
 __author__ = "AA"
 
-# --- .NET Imports ---
-from System.Collections.Generic import List as DotNetList
+from aatools import instrument
+instrument.start('Rooms to model')
+
+import os
 
 # --- Revit API Imports ---
 from Autodesk.Revit.DB import (
     FilteredElementCollector,
     BuiltInCategory,
-    Transaction,
     SpatialElementBoundaryOptions,
     CurveArray,
     Curve,
@@ -24,13 +27,17 @@ from Autodesk.Revit.DB import (
     UV,
     StorageType,
     LocationPoint,
-    Line
+    Line,
+    Arc
 )
 from Autodesk.Revit.DB.Architecture import Room
 
 # --- pyRevit Imports ---
 from pyrevit import forms
 from pyrevit import revit
+from pyrevit import EXEC_PARAMS
+
+from aatools import creation_ledger, room_geometry, session, transactions
 
 # --- Globals ---
 doc = revit.doc
@@ -64,143 +71,318 @@ def get_offset_from_user():
         forms.alert("Invalid input. Please enter a numerical value.", title="Input Error")
         return None
 
-def create_line_fingerprint(line, precision=4):
-    """Creates a unique, order-independent string for a line's 2D geometry."""
-    p1 = line.GetEndPoint(0)
-    p2 = line.GetEndPoint(1)
-    pt1_tuple = (round(p1.X, precision), round(p1.Y, precision))
-    pt2_tuple = (round(p2.X, precision), round(p2.Y, precision))
-    sorted_points = sorted([pt1_tuple, pt2_tuple])
-    return "{};{}".format(sorted_points[0], sorted_points[1])
-
-def merge_collinear_lines(curve_list):
-    """Takes a list of contiguous curves and merges any adjacent, collinear lines."""
-    if not curve_list: return []
-    merged_curves = []
-    while curve_list:
-        current_curve = curve_list.pop(0)
-        if not isinstance(current_curve, Line):
-            merged_curves.append(current_curve)
-            continue
-        while True:
-            if not curve_list: break 
-            next_curve = curve_list[0] 
-            can_merge = False
-            if isinstance(next_curve, Line) and \
-               current_curve.Direction.IsAlmostEqualTo(next_curve.Direction) and \
-               current_curve.GetEndPoint(1).IsAlmostEqualTo(next_curve.GetEndPoint(0)):
-                can_merge = True
-            if can_merge:
-                new_start = current_curve.GetEndPoint(0)
-                new_end = next_curve.GetEndPoint(1)
-                current_curve = Line.CreateBound(new_start, new_end)
-                curve_list.pop(0)
-            else:
-                break
-        merged_curves.append(current_curve)
-    return merged_curves
+# --- Geometry Extraction and Replay ---
+
+def xyz_tuple(point):
+    return (point.X, point.Y, point.Z)
+
+def curve_to_data(curve, natives=None):
+    """Converts a Revit curve to plain curve data. Other curve kinds are kept in natives, or tessellated when natives is None."""
+    if isinstance(curve, Line):
+        return [room_geometry.make_line(xyz_tuple(curve.GetEndPoint(0)), xyz_tuple(curve.GetEndPoint(1)))]
+    if isinstance(curve, Arc):
+        points = [xyz_tuple(curve.GetEndPoint(0)), xyz_tuple(curve.GetEndPoint(1)), xyz_tuple(curve.Evaluate(0.5, True))]
+        return [{'kind': room_geometry.ARC, 'points': points}]
+    if natives is not None:
+        natives.append(curve)
+        return [{'kind': room_geometry.NATIVE, 'ref': len(natives) - 1}]
+    points = [xyz_tuple(p) for p in curve.Tessellate()]
+    return [room_geometry.make_line(a, b) for a, b in zip(points, points[1:])]
+
+def data_to_curve(curve_data, natives=None):
+    """Converts plain curve data back into a Revit curve."""
+    kind = curve_data['kind']
+    if kind == room_geometry.NATIVE:
+        offset = XYZ(*curve_data.get('offset', (0, 0, 0)))
+        return natives[curve_data['ref']].CreateTransformed(Transform.CreateTranslation(offset))
+    points = [XYZ(*p) for p in curve_data['points']]
+    if kind == room_geometry.ARC:
+        return Arc.Create(points[0], points[1], points[2])
+    return Line.CreateBound(points[0], points[1])
+
+def room_parameters(room):
+    """Returns the room's parameter values as {name: value}; element ids become integers."""
+    values = {}
+    for param in room.Parameters:
+        if not param.HasValue: continue
+        if param.StorageType == StorageType.String: values[param.Definition.Name] = param.AsString()
+        elif param.StorageType == StorageType.Double: values[param.Definition.Name] = param.AsDouble()
+        elif param.StorageType == StorageType.Integer: values[param.Definition.Name] = param.AsInteger()
+        elif param.StorageType == StorageType.ElementId: values[param.Definition.Name] = param.AsElementId().IntegerValue
+    return values
+
+def extract_floor(view, rooms, separators, natives=None, include_parameters=False):
+    """Reads room points, boundary loops and separators of the view into plain data."""
+    floor_rooms = []
+    for room in rooms:
+        if not isinstance(room.Location, LocationPoint): continue
+        loops = []
+        boundary_segments = room.GetBoundarySegments(SpatialElementBoundaryOptions())
+        for segment_list in boundary_segments or []:
+            loop = []
+            for seg in segment_list:
+                loop.extend(curve_to_data(seg.GetCurve(), natives))
+            loops.append(loop)
+        floor_room = {'id': room.Id.IntegerValue, 'point': xyz_tuple(room.Location.Point), 'loops': loops}
+        if include_parameters:
+            floor_room['parameters'] = room_parameters(room)
+        floor_rooms.append(floor_room)
+
+    floor_separators = []
+    for separator in separators:
+        for curve_data in curve_to_data(separator.Location.Curve, natives):
+            curve_data['source_id'] = separator.Id.IntegerValue
+            floor_separators.append(curve_data)
+
+    level = view.GenLevel
+    return {'floor': level.Name if level else view.Name, 'document': session.doc_key(doc),
+            'view_id': view.Id.IntegerValue, 'rooms': floor_rooms, 'separators': floor_separators}
+
+def copy_room_parameters(room, new_room):
+    """Copies every writable parameter value of room onto new_room."""
+    for param in room.Parameters:
+        if not param.IsReadOnly and param.HasValue:
+            new_param = new_room.get_Parameter(param.Definition)
+            if new_param and not new_param.IsReadOnly:
+                try:
+                    if param.StorageType == StorageType.String: new_param.Set(param.AsString())
+                    elif param.StorageType == StorageType.Double: new_param.Set(param.AsDouble())
+                    elif param.StorageType == StorageType.Integer: new_param.Set(param.AsInteger())
+                    elif param.StorageType == StorageType.ElementId: new_param.Set(param.AsElementId())
+                except: pass
+
+ROOM = creation_ledger.ROOM
+SEPARATOR = creation_ledger.SEPARATOR
+
+def replay_plan(plan, natives=None):
+    """Creates the rooms and separators of a plan in the active view. Returns the run's ledger, or None on failure."""
+    level = doc.GetElement(active_view.GenLevel.Id) if active_view.GenLevel else None
+    if not level:
+        forms.alert("Could not determine the level from the active view.", "Error")
+        return None
+
+    ledger = creation_ledger.CreationLedger(__title__, doc, active_view)
+    sketch_planes = []
+    new_room_boundary_lines = instrument.counted(doc.Create.NewRoomBoundaryLines, 'NewRoomBoundaryLines')
+    new_room_at = instrument.counted(doc.Create.NewRoom, 'NewRoom')
+
+    def create_sketch_plane():
+        sketch_planes.append(SketchPlane.Create(doc, level.Id))
+        ledger.record(sketch_planes[0].Id, creation_ledger.SKETCH_PLANE)
+
+    def create(item):
+        kind, data, _index = item
+        if kind == ROOM:
+            # --- Part A: Create and place the new room ---
+            point = data['point']
+            new_room = new_room_at(level, UV(point[0], point[1]))
+            if not new_room:
+                return transactions.SKIPPED
+            source_room = doc.GetElement(ElementId(data['source_id']))
+            if source_room:
+                copy_room_parameters(source_room, new_room)
+            ledger.record(new_room.Id, ROOM, data['source_id'])
+        else:
+            # --- Part B: Create the separator (room boundaries and standalone lines) ---
+            temp_curve_array = CurveArray()
+            temp_curve_array.Append(data_to_curve(data, natives))
+            new_sep = new_room_boundary_lines(sketch_planes[0], temp_curve_array, active_view)
+            for el in new_sep:
+                ledger.record(el.Id, SEPARATOR, data.get('source_id'))
+
+    def item_id(item):
+        kind, data, index = item
+        return "Room {}".format(data['source_id']) if kind == ROOM else "Separator {}".format(index + 1)
+
+    items = ([(ROOM, r, i) for i, r in enumerate(plan['rooms'])] +
+             [(SEPARATOR, c, i) for i, c in enumerate(plan['separators'])])
+    # A failing room or separator is rolled back on its own; the rest of the plan is kept.
+    with instrument.phase('replay', len(items)):
+        log = transactions.run_items(doc, "Copy Rooms and Separators with Offset", items, create,
+                                     isolate=True, item_id=item_id, prepare=create_sketch_plane)
+
+    if not log.ok:
+        # No room or separator was kept; the committed sketch plane is removed so nothing is orphaned.
+        with instrument.phase('cleanup', len(ledger)):
+            creation_ledger.delete_run(doc, ledger, "Remove Unused Sketch Plane")
+        ledger.clear()
+    if log.failed:
+        forms.alert(log.summary(), title="Some Elements Were Not Created")
+    return ledger
+
+def report_created(ledger):
+    """Selects the new elements, remembers the run and tells the user what was created."""
+    if ledger:
+        with instrument.phase('select', len(ledger)):
+            creation_ledger.select(uidoc, ledger, ROOM, SEPARATOR)
+        creation_ledger.remember(doc, ledger)
+        counts = ledger.counts()
+        message = "Successfully created {} new rooms and {} new separator lines.".format(
+            counts.get(ROOM, 0), counts.get(SEPARATOR, 0))
+        forms.alert(message, title="Script Completed")
+
+def check_view():
+    if not (active_view.ViewType.ToString() in ['FloorPlan', 'CeilingPlan']):
+        forms.alert("Please run this script in a Floor Plan or Ceiling Plan view.", title="Wrong View Type")
+        return False
+    return True
 
 def main():
     """Main execution function of the script."""
     # 1. Pre-checks
-    if not (active_view.ViewType.ToString() in ['FloorPlan', 'CeilingPlan']):
-        forms.alert("Please run this script in a Floor Plan or Ceiling Plan view.", title="Wrong View Type")
+    if not check_view():
         return
-        
-    visible_rooms = get_visible_rooms(active_view)
-    visible_separators = get_visible_separators(active_view)
+
+    with instrument.phase('collect') as p:
+        visible_rooms = get_visible_rooms(active_view)
+        visible_separators = get_visible_separators(active_view)
+        p.count = len(visible_rooms) + len(visible_separators)
 
     if not visible_rooms and not visible_separators:
         forms.alert("No visible rooms or room separators found.", title="Nothing to Copy")
         return
 
+    instrument.ready()
     offset_y = get_offset_from_user()
     if offset_y is None: return
 
-    # 2. Main Logic
-    newly_created_element_ids = []
-    created_line_fingerprints = set()
-
-    with Transaction(doc, "Copy Rooms and Separators with Offset") as t:
-        t.Start()
-
-        level = doc.GetElement(active_view.GenLevel.Id)
-        if not level:
-            t.RollBack()
-            forms.alert("Could not determine the level from the active view.", "Error")
-            return
-
-        sketch_plane = SketchPlane.Create(doc, level.Id)
-        translation = XYZ(0, offset_y, 0)
-        transform = Transform.CreateTranslation(translation)
-
-        # --- Part A: Process Room Boundaries ---
-        for room in visible_rooms:
-            if not isinstance(room.Location, LocationPoint): continue
-
-            # Create and place the new room
-            original_loc = room.Location.Point
-            new_loc = transform.OfPoint(original_loc)
-            new_room = doc.Create.NewRoom(level, UV(new_loc.X, new_loc.Y))
-            if new_room:
-                newly_created_element_ids.append(new_room.Id)
-                # Copy parameters
-                for param in room.Parameters:
-                    if not param.IsReadOnly and param.HasValue:
-                        new_param = new_room.get_Parameter(param.Definition)
-                        if new_param and not new_param.IsReadOnly:
-                            try:
-                                if param.StorageType == StorageType.String: new_param.Set(param.AsString())
-                                elif param.StorageType == StorageType.Double: new_param.Set(param.AsDouble())
-                                elif param.StorageType == StorageType.Integer: new_param.Set(param.AsInteger())
-                                elif param.StorageType == StorageType.ElementId: new_param.Set(param.AsElementId())
-                            except: pass
-            
-            # Create boundaries for the placed room
-            boundary_segments = room.GetBoundarySegments(SpatialElementBoundaryOptions())
-            if not boundary_segments: continue
-            for segment_list in boundary_segments:
-                loop_curves = [seg.GetCurve().CreateTransformed(transform) for seg in segment_list]
-                merged_loop_curves = merge_collinear_lines(loop_curves)
-                
-                for curve in merged_loop_curves:
-                    # Create a temporary CurveArray for the creation method
-                    temp_curve_array = CurveArray()
-                    temp_curve_array.Append(curve)
-                    
-                    if isinstance(curve, Line):
-                        fingerprint = create_line_fingerprint(curve)
-                        if fingerprint not in created_line_fingerprints:
-                            new_sep = doc.Create.NewRoomBoundaryLines(sketch_plane, temp_curve_array, active_view)
-                            newly_created_element_ids.extend([el.Id for el in new_sep])
-                            created_line_fingerprints.add(fingerprint)
-                    else: # For arcs, etc., create without fingerprinting
-                        new_sep = doc.Create.NewRoomBoundaryLines(sketch_plane, temp_curve_array, active_view)
-                        newly_created_element_ids.extend([el.Id for el in new_sep])
-
-        # --- Part B: Process Standalone Room Separators ---
-        for separator in visible_separators:
-            original_curve = separator.Location.Curve
-            if isinstance(original_curve, Line):
-                new_curve = original_curve.CreateTransformed(transform)
-                fingerprint = create_line_fingerprint(new_curve)
-                if fingerprint not in created_line_fingerprints:
-                    # Create a temporary CurveArray for the creation method
-                    temp_curve_array = CurveArray()
-                    temp_curve_array.Append(new_curve)
-                    new_sep = doc.Create.NewRoomBoundaryLines(sketch_plane, temp_curve_array, active_view)
-                    newly_created_element_ids.extend([el.Id for el in new_sep])
-                    created_line_fingerprints.add(fingerprint)
-        t.Commit()
-
-    # 3. Post-processing and User Feedback
-    if newly_created_element_ids:
-        uidoc.Selection.SetElementIds(DotNetList[ElementId](newly_created_element_ids))
-        total_rooms = len([eid for eid in newly_created_element_ids if doc.GetElement(eid).Category.Id.IntegerValue == int(BuiltInCategory.OST_Rooms)])
-        total_separators = len(newly_created_element_ids) - total_rooms
-        message = "Successfully created {} new rooms and {} new separator lines.".format(total_rooms, total_separators)
-        forms.alert(message, title="Script Completed")
+    # 2. Plan the copy outside of the Revit API
+    natives = []
+    with instrument.phase('plan') as p:
+        floor = extract_floor(active_view, visible_rooms, visible_separators, natives)
+        plan = room_geometry.build_plan(floor, (0, offset_y, 0))
+        p.count = len(plan['rooms']) + len(plan['separators'])
+
+    # 3. Replay the plan and report
+    ledger = replay_plan(plan, natives)
+    if ledger is None: return
+    report_created(ledger)
+
+def export_boundaries():
+    """Writes the view's boundary snapshot for the batch planner; an unchanged snapshot is left as is."""
+    from aatools import room_snapshot
+    visible_rooms = get_visible_rooms(active_view)
+    visible_separators = get_visible_separators(active_view)
+    if not visible_rooms and not visible_separators:
+        forms.alert("No visible rooms or room separators found.", title="Nothing to Export")
+        return
+
+    export_folder = forms.pick_folder()
+    if not export_folder: return
+    snapshot_name = "{} - {}{}".format(doc.Title, active_view.Id.IntegerValue, room_snapshot.FILE_EXTENSION)
+    with instrument.phase('export', len(visible_rooms) + len(visible_separators)):
+        floor = extract_floor(active_view, visible_rooms, visible_separators, include_parameters=True)
+        _content_hash, written = room_snapshot.write_snapshot(os.path.join(export_folder, snapshot_name), floor)
+    if written:
+        message = "Exported {} rooms and {} separators to '{}'.".format(
+            len(floor['rooms']), len(floor['separators']), snapshot_name)
+    else:
+        message = "The boundaries have not changed since '{}' was exported.".format(snapshot_name)
+    forms.alert(message, title="Boundaries Exported")
+
+def replay_plan_file():
+    """Replays the plan built for the active view from a batch planner output file."""
+    plan_path = forms.pick_file(file_ext='ndjson')
+    if not plan_path: return
+    view_id = active_view.Id.IntegerValue
+    plans = [p for p in room_geometry.iter_floors(plan_path) if p.get('view_id') == view_id]
+    # View ids repeat across models: like undo manifests, plans of another model are refused.
+    doc_key = session.doc_key(doc)
+    plan = next((p for p in plans if p.get('document') in (None, doc_key)), None)
+    if plan is None and plans:
+        forms.alert("The plan for this view was exported from another model:\n{}".format(
+            plans[0]['document']), title="Wrong Model")
+        return
+    if plan is None:
+        forms.alert("The plan file has no plan for the active view.", title="No Plan Found")
+        return
+    ledger = replay_plan(plan)
+    if ledger is None: return
+    report_created(ledger)
+
+# --- Run Tools (creation ledger) ---
+
+def get_last_run():
+    ledger = creation_ledger.last_run(doc)
+    if ledger is None:
+        forms.alert("Nothing has been created in this model during this Revit session.", title="No Run Found")
+    return ledger
+
+def select_last_run(kind):
+    """Selects only the rooms or only the separators of the last run."""
+    ledger = get_last_run()
+    if ledger is None: return
+    if not creation_ledger.select(uidoc, ledger, kind):
+        forms.alert("The last run created no {}s.".format(kind), title="Nothing to Select")
+
+def export_manifest():
+    """Saves the last run's ledger as an undo manifest."""
+    ledger = get_last_run()
+    if ledger is None: return
+    manifest_path = forms.save_file(file_ext='json', default_name="{} - {}".format(__title__, ledger.run_id))
+    if not manifest_path: return
+    ledger.save(manifest_path)
+    forms.alert("Saved the undo manifest of {} elements.".format(len(ledger)), title="Manifest Exported")
+
+def delete_run(ledger):
+    """Deletes exactly the elements of one run after a confirmation."""
+    if not ledger.belongs_to(doc):
+        forms.alert("The manifest was written for another model:\n{}".format(ledger.doc_key), title="Wrong Model")
+        return
+    present, mismatched = creation_ledger.check_run(doc, ledger)
+    kinds = [entry.kind for entry in present]
+    message = "Delete the {} rooms and {} separator lines created on {}?".format(
+        kinds.count(ROOM), kinds.count(SEPARATOR), ledger.created[:19].replace('T', ' '))
+    if mismatched:
+        message += "\n\n{} ids of the run now belong to other elements and will be kept: {}".format(
+            len(mismatched), ", ".join(str(entry.element_id) for entry in mismatched[:10]))
+    if not forms.alert(message, yes=True, no=True):
+        return
+    with instrument.phase('delete', len(ledger)):
+        deleted_count, mismatched = creation_ledger.delete_run(doc, ledger, "Delete Copied Rooms and Separators")
+    message = "Deleted {} elements.".format(deleted_count)
+    if mismatched:
+        message += "\nKept {} elements that are not what the run created.".format(len(mismatched))
+    forms.alert(message, title="Run Deleted")
+
+def delete_last_run():
+    ledger = get_last_run()
+    if ledger is None: return
+    delete_run(ledger)
+
+def delete_run_from_manifest():
+    manifest_path = forms.pick_file(file_ext='json')
+    if not manifest_path: return
+    try:
+        ledger = creation_ledger.CreationLedger.load(manifest_path)
+    except Exception as e:
+        forms.alert("Could not read the undo manifest.\nError: {}".format(e), title="Invalid Manifest")
+        return
+    delete_run(ledger)
+
+def config_main():
+    """Shift-click: batch planning and run tools."""
+    if not check_view():
+        return
+    options = [
+        ('Export boundaries for batch planning', export_boundaries),
+        ('Replay a plan file', replay_plan_file),
+        ('Select rooms of the last run', lambda: select_last_run(ROOM)),
+        ('Select separators of the last run', lambda: select_last_run(SEPARATOR)),
+        ('Export the last run as an undo manifest', export_manifest),
+        ('Delete the last run', delete_last_run),
+        ('Delete a run from an undo manifest', delete_run_from_manifest),
+    ]
+    instrument.ready()
+    selected = forms.CommandSwitchWindow.show([name for name, _action in options], message='Select an option:')
+    for name, action in options:
+        if name == selected:
+            action()
 
 # --- Script Execution ---
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    if EXEC_PARAMS.config_mode:
+        config_main()
+    else:
+        main()
+    instrument.finish()
\ No newline at end of file
@@ -1,15 +1,23 @@
 # -*- coding: utf-8 -*-
+# Keeps the engine alive so the window and its event handler outlive the click.
+__persistentengine__ = True
+
+from aatools import instrument
+instrument.start("Change parameters")
+
 import os
-from pyrevit import forms, script
 
 # Revit API imports
 from Autodesk.Revit.UI import IExternalEventHandler, ExternalEvent
 
-# .NET / WPF imports
-import wpf
-from System.Windows.Controls import (StackPanel, ComboBox, TextBox, CheckBox,
-                                     Orientation, DockPanel, Dock)
-from System.Windows import (Thickness, VerticalAlignment, Window)
+# .NET / WPF imports; wpf and the controls are imported when the window is built.
+from System.Windows import Window, WindowState
+
+from aatools import session, transactions
+
+# The open window is kept in the session; a second click brings it back
+# instead of re-parsing ui.xaml and creating another handler and event.
+WINDOW_KEY = 'ParameterEditor.window'
 
 class RevitApiHandler(IExternalEventHandler):
     def __init__(self, window_instance):
@@ -24,6 +32,7 @@ class RevitApiHandler(IExternalEventHandler):
         except Exception:
             return
 
+        instrument.start("Change parameters ({})".format(self.action))
         try:
             if self.action == "get_parameters":
                 self._get_parameters(doc, uidoc)
@@ -31,6 +40,7 @@ class RevitApiHandler(IExternalEventHandler):
                 self._set_parameters(doc, uidoc)
         except Exception as e:
             print("Error in Revit API Handler: {}".format(e))
+        instrument.finish()
 
     def GetName(self):
         return "pyRevit Parameter Editor Revit API Handler"
@@ -45,9 +55,10 @@ class RevitApiHandler(IExternalEventHandler):
 
         selection = [doc.GetElement(el_id) for el_id in selection_ids]
         param_names = set()
-        for el in selection:
-            for param in el.Parameters:
-                param_names.add(param.Definition.Name)
+        with instrument.phase('read parameters', len(selection)):
+            for el in selection:
+                for param in el.Parameters:
+                    param_names.add(param.Definition.Name)
         
         sorted_params = sorted(list(param_names))
 
@@ -56,36 +67,41 @@ class RevitApiHandler(IExternalEventHandler):
         )
 
     def _set_parameters(self, doc, uidoc):
-        from Autodesk.Revit.DB import Transaction
-
         selection_ids = uidoc.Selection.GetElementIds()
         if not selection_ids or not self.data_to_apply:
             return
 
         selection = [doc.GetElement(el_id) for el_id in selection_ids]
 
-        t = Transaction(doc, "pyRevit: Apply Parameters")
+        def apply_values(element):
+            errors = []
+            lookup_parameter = instrument.counted(element.LookupParameter, 'LookupParameter')
+            for param_name, new_value in self.data_to_apply:
+                param = lookup_parameter(param_name)
+                if param and not param.IsReadOnly:
+                    try:
+                        param.Set(new_value)
+                    except Exception as e:
+                        errors.append('"{}": {}'.format(param_name, e))
+            # The other values of the element are kept; it is only reported as failed.
+            if errors:
+                raise Exception("; ".join(errors))
+
         try:
-            t.Start()
-            for element in selection:
-                for param_name, new_value in self.data_to_apply:
-                    param = element.LookupParameter(param_name)
-                    if param and not param.IsReadOnly:
-                        try:
-                            param.Set(new_value)
-                        except Exception as e:
-                            print('Failed to set "{}" on Element ID {}. Error: {}'.format(param_name, element.Id, e))
-            t.Commit()
+            with instrument.phase('set parameters', len(selection)):
+                log = transactions.run_items(doc, "pyRevit: Apply Parameters", selection, apply_values)
         except Exception as e:
-            if t.HasStarted():
-                t.RollBack()
             print("Transaction failed: {}".format(e))
+            return
+        if log.failed:
+            print(log.summary())
         
 
 
 # The WPF Window Class
 class ParameterEditorWindow(Window):
     def __init__(self, handler, external_event, initial_rows=5):
+        import wpf
         self.handler = handler
         self.external_event = external_event
 
@@ -96,13 +112,21 @@ class ParameterEditorWindow(Window):
         for _ in range(initial_rows):
             self.add_new_row()
 
+        self.Closed += self.window_closed
+        session.set(WINDOW_KEY, self)
         self.Show()
 
+    def window_closed(self, sender, args):
+        if session.get(WINDOW_KEY) is self:
+            session.pop(WINDOW_KEY)
+
     def show_messagebox(self, message, title):
         from System.Windows import MessageBox, MessageBoxButton, MessageBoxImage
         MessageBox.Show(self, message, title, MessageBoxButton.OK, MessageBoxImage.Information)
 
     def add_new_row(self):
+        from System.Windows import Thickness, VerticalAlignment
+        from System.Windows.Controls import ComboBox, TextBox, CheckBox, DockPanel, Dock
         param_combobox = ComboBox(Margin=Thickness(0, 0, 5, 5), VerticalContentAlignment=VerticalAlignment.Center, MinWidth=180)
         new_value_textbox = TextBox(Margin=Thickness(0, 0, 5, 5), VerticalContentAlignment=VerticalAlignment.Center, MinWidth=120)
         lock_checkbox = CheckBox(ToolTip="Lock this row to prevent clearing the value.", VerticalAlignment=VerticalAlignment.Center)
@@ -150,8 +174,22 @@ class ParameterEditorWindow(Window):
                 row['text'].Clear()
 
 
+def reuse_open_window():
+    """Activates the already open editor window; False when there is none."""
+    window = session.get(WINDOW_KEY)
+    if window is None or not window.IsLoaded:
+        return False
+    if window.WindowState == WindowState.Minimized:
+        window.WindowState = WindowState.Normal
+    window.Activate()
+    return True
+
+
 if __name__ == "__main__":
-    revit_handler = RevitApiHandler(None)
-    ext_event = ExternalEvent.Create(revit_handler)
-    ui_window = ParameterEditorWindow(revit_handler, ext_event)
-    revit_handler.window = ui_window
\ No newline at end of file
+    if not reuse_open_window():
+        revit_handler = RevitApiHandler(None)
+        ext_event = ExternalEvent.Create(revit_handler)
+        ui_window = ParameterEditorWindow(revit_handler, ext_event)
+        revit_handler.window = ui_window
+    instrument.ready()
+    instrument.finish()
\ No newline at end of file
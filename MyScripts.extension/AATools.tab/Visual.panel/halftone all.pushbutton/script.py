@@ -6,9 +6,14 @@ Isolates selected elements using a saved transparency setting.
 __title__ = 'Isolate'
 __author__ = 'AA'
 
+from aatools import instrument
+instrument.start('Isolate')
+
 import os
 from pyrevit import revit, DB, forms
 
+from aatools import transactions
+
 # --- Manually find the extension's root directory ---
 script_path = os.path.dirname(__file__)
 current_path = script_path
@@ -37,31 +42,38 @@ except Exception as e:
 doc = revit.doc
 view = revit.active_view
 selection_ids = revit.get_selection().element_ids
+set_overrides = instrument.counted(view.SetElementOverrides, 'SetElementOverrides')
+
+with instrument.phase('collect') as p:
+    all_elements_in_view = DB.FilteredElementCollector(doc, view.Id).ToElements()
+    p.count = len(all_elements_in_view)
+
+# Elements that do not accept overrides simply end up as failed items in the log.
+if selection_ids:
+    override_settings = DB.OverrideGraphicSettings()
+    override_settings.SetHalftone(True)
+    override_settings.SetSurfaceTransparency(transparency_value)
+
+    selected_ids = set(selection_ids)
+
+    def override(el):
+        if el.Id in selected_ids:
+            return transactions.SKIPPED
+        set_overrides(el.Id, override_settings)
+
+    with instrument.phase('override', len(all_elements_in_view)):
+        transactions.run_items(doc, 'Isolate with Halftone/Transparency', all_elements_in_view, override)
+else:
+    # Clear logic
+    clear_settings = DB.OverrideGraphicSettings()
+
+    def clear(el):
+        current_overrides = view.GetElementOverrides(el.Id)
+        if not (current_overrides.Halftone or current_overrides.Transparency > 0):
+            return transactions.SKIPPED
+        set_overrides(el.Id, clear_settings)
+
+    with instrument.phase('clear', len(all_elements_in_view)):
+        transactions.run_items(doc, 'Isolate with Halftone/Transparency', all_elements_in_view, clear)
 
-with revit.Transaction('Isolate with Halftone/Transparency'):
-    if selection_ids:
-        all_elements_in_view = DB.FilteredElementCollector(doc, view.Id).ToElements()
-        override_settings = DB.OverrideGraphicSettings()
-        override_settings.SetHalftone(True)
-        override_settings.SetSurfaceTransparency(transparency_value)
-
-        selected_ids = set(selection_ids)
-        for el in all_elements_in_view:
-            if el.Id not in selected_ids:
-                try:
-                    view.SetElementOverrides(el.Id, override_settings)
-                except Exception:
-                    pass
-    else:
-        # Clear logic
-        all_elements_in_view = DB.FilteredElementCollector(doc, view.Id).ToElements()
-        clear_settings = DB.OverrideGraphicSettings()
-        cleared_count = 0
-        for el in all_elements_in_view:
-            current_overrides = view.GetElementOverrides(el.Id)
-            if current_overrides.Halftone or current_overrides.Transparency > 0:
-                try:
-                    view.SetElementOverrides(el.Id, clear_settings)
-                    cleared_count += 1
-                except Exception:
-                    pass
+instrument.finish()
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+Shared helpers for the AATools tab buttons.
+"""
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Resolves where the bend radius of a conduit fitting lives and writes it.
+
+The radius can be an instance parameter (built-in or one of a few common
+family parameter names) or a type parameter. That is decided once per
+fitting type, and type parameters are written once per type no matter
+how many selected instances share it. When an instance parameter refuses
+the value, the type parameter is tried instead.
+"""
+
+from Autodesk.Revit.DB import BuiltInParameter, ElementId
+
+RADIUS_PARAM_NAMES = ["Radius", "Nominal Radius", "Bend Radius"]
+
+INSTANCE = 'instance'
+TYPE = 'type'
+
+
+def find_radius_param(element, writable=True):
+    """Returns the first writable (or, for reading, any) radius parameter of element, or None."""
+    param_builtin = element.get_Parameter(BuiltInParameter.RBS_CONDUIT_BENDRADIUS)
+    if param_builtin and not (writable and param_builtin.IsReadOnly):
+        return param_builtin
+    for param_name in RADIUS_PARAM_NAMES:
+        p = element.LookupParameter(param_name)
+        if p and not (writable and p.IsReadOnly):
+            return p
+    return None
+
+
+class RadiusResolver(object):
+    """
+    Caches, per fitting type id, whether the radius is an instance or a type parameter.
+    writable=False also resolves read-only radii, for reports.
+    """
+
+    def __init__(self, doc, writable=True):
+        self.doc = doc
+        self.writable = writable
+        self._locations = {}
+        self._type_definitions = {}
+
+    def resolve(self, element):
+        """
+        Returns (location, definition) for element's type.
+        location is INSTANCE, TYPE or None when no (writable) radius exists
+        or the element has no type.
+        """
+        type_id = element.GetTypeId()
+        if type_id == ElementId.InvalidElementId:
+            return (None, None)
+        cached = self._locations.get(type_id.IntegerValue)
+        if cached is not None:
+            return cached
+
+        resolved = (None, None)
+        param = find_radius_param(element, self.writable)
+        if param is not None:
+            resolved = (INSTANCE, param.Definition)
+        else:
+            definition = self.type_definition(element)
+            if definition is not None:
+                resolved = (TYPE, definition)
+
+        self._locations[type_id.IntegerValue] = resolved
+        return resolved
+
+    def type_definition(self, element):
+        """Definition of the (writable) radius parameter of element's type, or None."""
+        type_id = element.GetTypeId()
+        if type_id.IntegerValue not in self._type_definitions:
+            elem_type = self.doc.GetElement(type_id)
+            type_param = find_radius_param(elem_type, self.writable) if elem_type else None
+            self._type_definitions[type_id.IntegerValue] = type_param.Definition if type_param else None
+        return self._type_definitions[type_id.IntegerValue]
+
+
+class RadiusResult(object):
+    """Element ids grouped by what happened to them."""
+
+    def __init__(self):
+        self.changed = []
+        self.type_level = []
+        self.skipped = []
+        self.conflicting = []
+        self.failed = []
+
+    @property
+    def modified_count(self):
+        return len(self.changed) + len(self.type_level)
+
+    def summary(self):
+        lines = ["Changed: {}".format(len(self.changed)),
+                 "Changed through type: {}".format(len(self.type_level)),
+                 "Skipped (no radius): {}".format(len(self.skipped))]
+        if self.conflicting:
+            lines.append("Skipped (type radius would change other bends): {}".format(
+                len(self.conflicting)))
+        lines.append("Failed: {}".format(len(self.failed)))
+        return "\n".join(lines)
+
+
+def set_radius(doc, elements, radius_value, resolver=None, result=None, type_fallback=True):
+    """
+    Sets the bend radius of elements (feet) and returns a RadiusResult.
+    Pass result to accumulate several calls into one report. With
+    type_fallback=False an instance that refuses the value is reported as
+    failed instead of writing its type.
+    Must be called inside an open transaction.
+    """
+    resolver = resolver or RadiusResolver(doc)
+    result = result or RadiusResult()
+    by_type = {}
+
+    for element in elements:
+        location, definition = resolver.resolve(element)
+        if location == INSTANCE:
+            param = element.get_Parameter(definition)
+            if param is None or param.IsReadOnly:
+                result.skipped.append(element.Id)
+                continue
+            try:
+                param.Set(radius_value)
+                result.changed.append(element.Id)
+                continue
+            except Exception:
+                # Fall back to the type parameter, as the per-element lookup did.
+                definition = resolver.type_definition(element) if type_fallback else None
+                if definition is None:
+                    result.failed.append(element.Id)
+                    continue
+                location = TYPE
+        if location == TYPE:
+            type_id = element.GetTypeId()
+            by_type.setdefault(type_id.IntegerValue, (type_id, definition, []))[2].append(element.Id)
+        else:
+            result.skipped.append(element.Id)
+
+    # Each type parameter is written exactly once.
+    for type_id, definition, instance_ids in by_type.values():
+        try:
+            doc.GetElement(type_id).get_Parameter(definition).Set(radius_value)
+            result.type_level.extend(instance_ids)
+        except Exception:
+            result.failed.extend(instance_ids)
+
+    return result
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Model-wide bend radius normalization driven by a size/angle rule table.
+
+The rule table lives in 'bend_radius_rules.json' in the extension's root
+directory. Each rule may name a trade size and/or a bend angle (degrees)
+and gives the radius in inches; the first matching rule wins.
+"""
+
+import math
+
+from Autodesk.Revit.DB import (
+    FilteredElementCollector,
+    BuiltInCategory,
+    BuiltInParameter,
+    ElementId,
+    ElementParameterFilter,
+    FamilyInstance,
+    LogicalOrFilter,
+    ParameterFilterRuleFactory,
+)
+
+from aatools import instrument, settings
+from aatools.bend_radius import TYPE, RadiusResolver, RadiusResult, set_radius
+
+RULES_FILE = 'bend_radius_rules.json'
+ANGLE_PARAM_NAMES = ["Angle", "Bend Angle"]
+DEFAULT_ANGLE_TOLERANCE = 0.5
+
+_SIZE_MARKS = ('"', u'ø', u'Ø')
+
+
+def normalize_size(size_text):
+    """Returns the trade size of a Size value: '3/4"ø-3/4"ø' -> '3/4'."""
+    if not size_text:
+        return None
+    size = size_text.split('-')[0]
+    for mark in _SIZE_MARKS:
+        size = size.replace(mark, '')
+    return ' '.join(size.split()) or None
+
+
+class BendRule(object):
+    """One row of the rule table; size/angle of None match anything."""
+
+    def __init__(self, radius_inches, size=None, angle=None):
+        self.size = normalize_size(size)
+        self.raw_size = size
+        self.angle = float(angle) if angle is not None else None
+        self.radius = float(radius_inches) / 12.0
+
+    def matches(self, size, angle, tolerance):
+        if self.size is not None and self.size != size:
+            return False
+        if self.angle is not None and (angle is None or abs(self.angle - angle) > tolerance):
+            return False
+        return True
+
+
+class RuleTable(object):
+    """Ordered rules plus a cache of (size, angle) -> radius lookups."""
+
+    def __init__(self, rules, angle_tolerance=DEFAULT_ANGLE_TOLERANCE):
+        self.rules = rules
+        self.angle_tolerance = angle_tolerance
+        self._lookups = {}
+
+    def radius_for(self, size, angle):
+        """Returns the radius (feet) for a bend, or None when no rule matches."""
+        key = (size, round(angle, 3) if angle is not None else None)
+        if key not in self._lookups:
+            radius = None
+            for rule in self.rules:
+                if rule.matches(size, angle, self.angle_tolerance):
+                    radius = rule.radius
+                    break
+            self._lookups[key] = radius
+        return self._lookups[key]
+
+    def sizes(self):
+        """Returns the raw sizes the table is limited to, or None when a rule matches any size."""
+        if any(rule.size is None for rule in self.rules):
+            return None
+        return sorted(set(rule.raw_size for rule in self.rules))
+
+
+def load_rules():
+    """Reads the rule table from the extension settings. Raises ValueError on bad rows."""
+    data = settings.load_json(RULES_FILE, default={}) or {}
+    rules = []
+    for index, row in enumerate(data.get('rules', [])):
+        if 'radius' not in row:
+            raise ValueError("Rule {} in {} has no 'radius'.".format(index + 1, RULES_FILE))
+        rules.append(BendRule(row['radius'], row.get('size'), row.get('angle')))
+    if not rules:
+        raise ValueError("No rules found in {}.".format(RULES_FILE))
+    return RuleTable(rules, float(data.get('angle_tolerance', DEFAULT_ANGLE_TOLERANCE)))
+
+
+# --- Collection ---
+
+def _begins_with_rule(param_id, text):
+    try:
+        return ParameterFilterRuleFactory.CreateBeginsWithRule(param_id, text)
+    except TypeError:
+        # Revit 2022 and older also take a case sensitivity flag.
+        return ParameterFilterRuleFactory.CreateBeginsWithRule(param_id, text, False)
+
+
+def _size_filter(sizes):
+    """Native pre-filter on the built-in Size parameter; exact matching happens later."""
+    size_param_id = ElementId(BuiltInParameter.RBS_CALCULATED_SIZE)
+    filters = [ElementParameterFilter(_begins_with_rule(size_param_id, normalize_size(size)))
+               for size in sizes]
+    if len(filters) == 1:
+        return filters[0]
+    return LogicalOrFilter(filters)
+
+
+def collect_bends(doc, table):
+    """
+    Yields (fitting, trade_size, angle_degrees) for every conduit fitting that
+    has a bend angle. The angle parameter is looked up once per fitting type.
+    """
+    collector = FilteredElementCollector(doc)\
+        .OfCategory(BuiltInCategory.OST_ConduitFitting)\
+        .OfClass(FamilyInstance)
+    sizes = table.sizes()
+    if sizes:
+        collector = collector.WherePasses(_size_filter(sizes))
+
+    angle_definitions = {}
+    for fitting in collector:
+        type_key = fitting.GetTypeId().IntegerValue
+        if type_key not in angle_definitions:
+            definition = None
+            for name in ANGLE_PARAM_NAMES:
+                p = fitting.LookupParameter(name)
+                if p is not None:
+                    definition = p.Definition
+                    break
+            angle_definitions[type_key] = definition
+
+        definition = angle_definitions[type_key]
+        if definition is None:
+            # Couplings, boxes and other fittings without a bend angle.
+            continue
+        angle_param = fitting.get_Parameter(definition)
+        if angle_param is None:
+            continue
+
+        size_param = fitting.get_Parameter(BuiltInParameter.RBS_CALCULATED_SIZE)
+        size = normalize_size(size_param.AsString()) if size_param else None
+        yield fitting, size, math.degrees(angle_param.AsDouble())
+
+
+def normalize_model(doc, table):
+    """
+    Applies the rule table to every bend in doc and returns (RadiusResult, unmatched_count).
+    Must be called inside an open transaction; the caller regenerates once at the end.
+    A type-level radius changes every instance of the type, so it is written
+    only when all of them, in any size or angle, get the same radius from the
+    rules. Other types are left unchanged and their bends reported as conflicting.
+    """
+    resolver = RadiusResolver(doc)
+    result = RadiusResult()
+    groups = {}
+    by_type = {}
+    unmatched = 0
+    with instrument.phase('collect bends') as collect_phase:
+        for fitting, size, angle in collect_bends(doc, table):
+            radius = table.radius_for(size, angle)
+            if radius is None:
+                unmatched += 1
+            elif resolver.resolve(fitting)[0] == TYPE:
+                radii = by_type.setdefault(fitting.GetTypeId().IntegerValue, {})
+                radii.setdefault(radius, []).append(fitting)
+            else:
+                groups.setdefault(radius, []).append(fitting)
+        instance_counts = _instance_counts(doc, by_type) if by_type else {}
+        for type_key, radii in by_type.items():
+            matched = sum(len(fittings) for fittings in radii.values())
+            if len(radii) == 1 and matched == instance_counts.get(type_key):
+                radius, fittings = list(radii.items())[0]
+                groups.setdefault(radius, []).extend(fittings)
+            else:
+                result.conflicting.extend(f.Id for fittings in radii.values() for f in fittings)
+        collect_phase.count = (sum(len(fittings) for fittings in groups.values())
+                               + len(result.conflicting) + unmatched)
+
+    with instrument.phase('set radius') as set_phase:
+        for radius, fittings in groups.items():
+            # No type fallback: it would write a type that was not checked above.
+            set_radius(doc, fittings, radius, resolver=resolver, result=result, type_fallback=False)
+        set_phase.count = result.modified_count
+    return result, unmatched
+
+
+def _instance_counts(doc, type_keys):
+    """Placed instances per fitting type in type_keys, whatever their size or angle."""
+    counts = dict.fromkeys(type_keys, 0)
+    collector = FilteredElementCollector(doc)\
+        .OfCategory(BuiltInCategory.OST_ConduitFitting)\
+        .OfClass(FamilyInstance)
+    for fitting in collector:
+        type_key = fitting.GetTypeId().IntegerValue
+        if type_key in counts:
+            counts[type_key] += 1
+    return counts
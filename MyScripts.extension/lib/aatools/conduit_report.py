@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""
+Conduit quantity report: length and count per (type, size), bends per radius.
+
+Conduits and fittings are streamed once through native category filters
+into columnar accumulators, one list per measure and one row per
+(kind, type, size). Every element's contribution is remembered, so the
+next run of the same document version only re-reads the elements a
+DocumentChanged watcher saw change since then. Saving keeps the cache;
+any other version change (reload, sync with central) rebuilds it.
+"""
+
+from Autodesk.Revit.DB import (
+    FilteredElementCollector,
+    BuiltInCategory,
+    BuiltInParameter,
+    ElementId,
+    ElementMulticategoryFilter,
+    ElementType,
+)
+from System.Collections.Generic import List as DotNetList
+
+from aatools import conduit_types, instrument, session
+from aatools.bend_radius import RadiusResolver, INSTANCE, TYPE
+from aatools.bend_rules import normalize_size
+
+CONDUIT = conduit_types.CONDUIT
+FITTING = conduit_types.FITTING
+
+_CATEGORIES = {
+    CONDUIT: BuiltInCategory.OST_Conduit,
+    FITTING: BuiltInCategory.OST_ConduitFitting,
+}
+_CATEGORY_KINDS = dict((int(category), kind) for kind, category in _CATEGORIES.items())
+
+_REPORTS_KEY = 'conduit_report.reports'
+_WATCHER_KEY = 'conduit_report.watcher'
+
+FULL = 'full'
+INCREMENTAL = 'incremental'
+CACHED = 'cached'
+
+# Above this share of changed elements a full scan is cheaper than patching.
+REBUILD_RATIO = 0.5
+
+
+# --- Columnar accumulators ---
+
+def _new_state(version):
+    """The cached report as plain data, so it can live in the session."""
+    return {
+        'version': version,
+        'rows': {},            # (kind, type_id, size) -> row index
+        'kinds': [],
+        'type_ids': [],
+        'sizes': [],
+        'counts': [],
+        'lengths': [],         # feet, conduits only
+        'bends': [],           # {radius_inches: count}, fittings only
+        'elements': {},        # element id -> (row, length, radius_inches)
+        'radius_types': set(),  # fitting types that carry the radius
+        'pending': set(),      # element ids to re-read
+        'pending_types': set(),  # radius types whose instances must be re-read
+    }
+
+
+class QuantityTable(object):
+    """Adds and removes element contributions on the columnar state."""
+
+    def __init__(self, doc, state):
+        self.doc = doc
+        self.state = state
+        # Read-only radii (e.g. driven by a formula) are still reported.
+        self._resolver = RadiusResolver(doc, writable=False)
+        self._type_radius = {}
+
+    def _row(self, kind, type_id, size):
+        state = self.state
+        key = (kind, type_id, size)
+        row = state['rows'].get(key)
+        if row is None:
+            row = len(state['kinds'])
+            state['rows'][key] = row
+            state['kinds'].append(kind)
+            state['type_ids'].append(type_id)
+            state['sizes'].append(size)
+            state['counts'].append(0)
+            state['lengths'].append(0.0)
+            state['bends'].append({})
+        return row
+
+    def _radius(self, element):
+        """Bend radius in inches, or None for fittings without one."""
+        location, definition = self._resolver.resolve(element)
+        if location == INSTANCE:
+            param = element.get_Parameter(definition)
+        elif location == TYPE:
+            type_id = element.GetTypeId()
+            self.state['radius_types'].add(type_id.IntegerValue)
+            if type_id.IntegerValue in self._type_radius:
+                return self._type_radius[type_id.IntegerValue]
+            param = self.doc.GetElement(type_id).get_Parameter(definition)
+        else:
+            return None
+        radius = round(param.AsDouble() * 12.0, 2) if param and param.HasValue else None
+        if location == TYPE:
+            self._type_radius[element.GetTypeId().IntegerValue] = radius
+        return radius
+
+    def add(self, kind, element):
+        size_param = element.get_Parameter(BuiltInParameter.RBS_CALCULATED_SIZE)
+        size = normalize_size(size_param.AsString()) if size_param else None
+        row = self._row(kind, element.GetTypeId().IntegerValue, size)
+        length = 0.0
+        radius = None
+        if kind == CONDUIT:
+            length_param = element.get_Parameter(BuiltInParameter.CURVE_ELEM_LENGTH)
+            length = length_param.AsDouble() if length_param else 0.0
+            self.state['lengths'][row] += length
+        else:
+            radius = self._radius(element)
+            if radius is not None:
+                bends = self.state['bends'][row]
+                bends[radius] = bends.get(radius, 0) + 1
+        self.state['counts'][row] += 1
+        self.state['elements'][element.Id.IntegerValue] = (row, length, radius)
+
+    def remove(self, element_id):
+        contribution = self.state['elements'].pop(element_id, None)
+        if contribution is None:
+            return
+        row, length, radius = contribution
+        self.state['counts'][row] -= 1
+        self.state['lengths'][row] -= length
+        if radius is not None:
+            bends = self.state['bends'][row]
+            bends[radius] -= 1
+            if not bends[radius]:
+                del bends[radius]
+
+    def scan(self):
+        """Reads every conduit and fitting of the document once."""
+        for kind, category in _CATEGORIES.items():
+            with instrument.phase('scan ' + kind) as p:
+                collector = FilteredElementCollector(self.doc).OfCategory(category).WhereElementIsNotElementType()
+                count = 0
+                for element in collector:
+                    self.add(kind, element)
+                    count += 1
+                p.count = count
+
+    def refresh(self, element_ids):
+        """Re-reads the given element ids; deleted or unrelated ids only drop out."""
+        with instrument.phase('refresh', len(element_ids)):
+            for element_id in element_ids:
+                self.remove(element_id)
+                element = self.doc.GetElement(ElementId(element_id))
+                kind = _kind_of(element)
+                if kind is not None:
+                    self.add(kind, element)
+
+
+def _kind_of(element):
+    if element is None or element.Category is None or isinstance(element, ElementType):
+        return None
+    return _CATEGORY_KINDS.get(element.Category.Id.IntegerValue)
+
+
+def _instances_of_types(state, type_ids):
+    rows = set(row for row, type_id in enumerate(state['type_ids']) if type_id in type_ids)
+    return [element_id for element_id, contribution in state['elements'].items()
+            if contribution[0] in rows]
+
+
+# --- Cache ---
+
+def _reports():
+    reports = session.get(_REPORTS_KEY)
+    if reports is None:
+        reports = {}
+        session.set(_REPORTS_KEY, reports)
+    return reports
+
+
+def get_report(doc, refresh=True):
+    """
+    Returns (state, mode) with the quantities of doc. mode is CACHED, INCREMENTAL
+    or FULL. refresh=False always rescans the whole model.
+    """
+    watching = _ensure_watcher(doc)
+    reports = _reports()
+    key = session.doc_key(doc)
+    version = session.document_version(doc)
+    state = reports.get(key)
+
+    if refresh and watching and state is not None and state['version'] == version:
+        changed = set(state['pending'])
+        if state['pending_types']:
+            changed.update(_instances_of_types(state, state['pending_types']))
+        if not changed:
+            return state, CACHED
+        if len(changed) <= len(state['elements']) * REBUILD_RATIO:
+            state['pending'] = set()
+            state['pending_types'] = set()
+            QuantityTable(doc, state).refresh(sorted(changed))
+            return state, INCREMENTAL
+
+    state = _new_state(version)
+    QuantityTable(doc, state).scan()
+    if watching:
+        reports[key] = state
+    return state, FULL
+
+
+def invalidate(doc=None):
+    """Drops the cached report of doc, or of every document when doc is None."""
+    reports = session.get(_REPORTS_KEY)
+    if not reports:
+        return
+    if doc is None:
+        reports.clear()
+    else:
+        reports.pop(session.doc_key(doc), None)
+
+
+def _category_filter():
+    return ElementMulticategoryFilter(DotNetList[BuiltInCategory](list(_CATEGORIES.values())))
+
+
+def _on_document_changed(sender, args):
+    """Queues the conduit and fitting ids touched by a transaction, undo or redo."""
+    try:
+        state = (session.get(_REPORTS_KEY) or {}).get(session.doc_key(args.GetDocument()))
+        if state is None:
+            return
+        known = state['elements']
+        pending = state['pending']
+        # Deleted ids cannot be filtered; they only count when the report knows them.
+        category_filter = _category_filter()
+        for eid in args.GetAddedElementIds(category_filter):
+            pending.add(eid.IntegerValue)
+        modified = args.GetModifiedElementIds(category_filter)
+        for eid in list(modified) + list(args.GetDeletedElementIds()):
+            element_id = eid.IntegerValue
+            if element_id in known:
+                pending.add(element_id)
+            elif element_id in state['radius_types']:
+                state['pending_types'].add(element_id)
+    except Exception:
+        # Never let a cache problem surface inside someone else's transaction.
+        invalidate()
+
+
+def _on_document_saved(sender, args):
+    """A save changes the version but not the content: keep the report current."""
+    try:
+        state = (session.get(_REPORTS_KEY) or {}).get(session.doc_key(args.Document))
+        if state is not None:
+            state['version'] = session.document_version(args.Document)
+    except Exception:
+        invalidate()
+
+
+def _on_document_closing(sender, args):
+    try:
+        invalidate(args.Document)
+    except Exception:
+        invalidate()
+
+
+def _ensure_watcher(doc):
+    """Subscribes the change handlers once per Revit session; False when that fails."""
+    if session.get(_WATCHER_KEY):
+        return True
+    try:
+        application = doc.Application
+        application.DocumentChanged += _on_document_changed
+        application.DocumentSaved += _on_document_saved
+        application.DocumentClosing += _on_document_closing
+    except Exception:
+        # Without a watcher the cache cannot be trusted, so do not keep it.
+        return False
+    session.set(_WATCHER_KEY, True)
+    return True
+
+
+# --- Report rows ---
+
+def report_rows(doc, state):
+    """
+    Returns (conduit_rows, fitting_rows) sorted by type name and size.
+    Conduit rows are [type, size, count, length_ft]; fitting rows are
+    [type, size, count, {radius_inches: count}]. Empty rows are left out.
+    """
+    catalog = conduit_types.get_catalog(doc)
+    names = {}
+    for kind in (CONDUIT, FITTING):
+        names[kind] = dict((entry[1], name) for name, entry in catalog[kind].items())
+
+    conduit_rows = []
+    fitting_rows = []
+    for row, kind in enumerate(state['kinds']):
+        count = state['counts'][row]
+        if not count:
+            continue
+        type_id = state['type_ids'][row]
+        type_name = names[kind].get(type_id) or 'Type {}'.format(type_id)
+        size = state['sizes'][row] or '-'
+        if kind == CONDUIT:
+            conduit_rows.append([type_name, size, count, state['lengths'][row]])
+        else:
+            fitting_rows.append([type_name, size, count, dict(state['bends'][row])])
+    conduit_rows.sort(key=lambda r: (r[0], r[1]))
+    fitting_rows.sort(key=lambda r: (r[0], r[1]))
+    return conduit_rows, fitting_rows
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+Cached conduit / conduit fitting type catalog and named type presets.
+
+The catalog is collected once per document and kept for the Revit session.
+It is dropped as soon as a conduit or fitting type is added, deleted or
+modified in that document, when the document closes, and when its version
+changes other than by a save (reload, sync with central). Presets store type UniqueIds so they stay valid
+across documents (same template) and Revit versions.
+"""
+
+from Autodesk.Revit.DB import (
+    FilteredElementCollector,
+    BuiltInCategory,
+    BuiltInParameter,
+    ElementType,
+    ElementId,
+    ElementMulticategoryFilter,
+)
+from System.Collections.Generic import List as DotNetList
+from pyrevit import script
+
+from aatools import session
+
+# --- Unique Keys for Storing Data ---
+PRESETS_KEY = 'MyConduitChanger_TypePresets'
+ACTIVE_PRESET_KEY = 'MyConduitChanger_ActivePreset'
+# Pre-preset keys, read once so existing users keep their stored pair.
+LEGACY_CONDUIT_ID_KEY = 'MyConduitChanger_ConduitTypeID'
+LEGACY_FITTING_ID_KEY = 'MyConduitChanger_FittingTypeID'
+
+_CATALOG_KEY = 'conduit_types.catalog'
+_WATCHER_KEY = 'conduit_types.watcher'
+
+CONDUIT = 'conduit'
+FITTING = 'fitting'
+
+_CATEGORIES = {
+    CONDUIT: BuiltInCategory.OST_Conduit,
+    FITTING: BuiltInCategory.OST_ConduitFitting,
+}
+
+
+# --- Type Catalog ---
+
+def _param_string(element, builtin_param):
+    param = element.get_Parameter(builtin_param)
+    if param and param.HasValue:
+        return param.AsString()
+    return None
+
+
+def type_display_name(elem_type, kind):
+    """Returns the name shown for a type: 'Type' for conduits, 'Family: Type' for fittings."""
+    type_name = _param_string(elem_type, BuiltInParameter.ALL_MODEL_TYPE_NAME)
+    if not type_name:
+        return None
+    if kind == CONDUIT:
+        return type_name
+    fam_name = _param_string(elem_type, BuiltInParameter.ALL_MODEL_FAMILY_NAME)
+    if not fam_name:
+        return None
+    return "{}: {}".format(fam_name, type_name)
+
+
+def _collect_catalog(doc):
+    """Scans the document once and returns {kind: {display_name: (unique_id, id_int)}}."""
+    catalog = {}
+    for kind, category in _CATEGORIES.items():
+        entries = {}
+        collector = FilteredElementCollector(doc).OfCategory(category).WhereElementIsElementType()
+        for t in collector:
+            name = type_display_name(t, kind)
+            if name:
+                entries[name] = (t.UniqueId, t.Id.IntegerValue)
+        catalog[kind] = entries
+    return catalog
+
+
+def _catalog_ids(catalog):
+    return frozenset(entry[1] for entries in catalog.values() for entry in entries.values())
+
+
+def get_catalog(doc):
+    """Returns the cached type catalog of doc, collecting it on first use."""
+    watching = _ensure_watcher(doc)
+    catalogs = session.get(_CATALOG_KEY)
+    if catalogs is None:
+        catalogs = {}
+        session.set(_CATALOG_KEY, catalogs)
+
+    key = session.doc_key(doc)
+    version = session.document_version(doc)
+    cached = catalogs.get(key)
+    if watching and cached is not None and cached['version'] == version:
+        return cached['catalog']
+
+    catalog = _collect_catalog(doc)
+    if watching:
+        catalogs[key] = {'catalog': catalog, 'ids': _catalog_ids(catalog), 'version': version}
+    else:
+        catalogs.pop(key, None)
+    return catalog
+
+
+def invalidate(doc=None):
+    """Drops the cached catalog of doc, or of every document when doc is None."""
+    catalogs = session.get(_CATALOG_KEY)
+    if not catalogs:
+        return
+    if doc is None:
+        catalogs.clear()
+    else:
+        catalogs.pop(session.doc_key(doc), None)
+
+
+def _category_filter():
+    return ElementMulticategoryFilter(DotNetList[BuiltInCategory](list(_CATEGORIES.values())))
+
+
+def _on_document_changed(sender, args):
+    """Invalidates the catalog when a conduit/fitting type is added, removed or edited."""
+    try:
+        doc = args.GetDocument()
+        catalogs = session.get(_CATALOG_KEY) or {}
+        cached = catalogs.get(session.doc_key(doc))
+        if cached is None:
+            return
+        known_ids = cached['ids']
+        for eid in list(args.GetDeletedElementIds()) + list(args.GetModifiedElementIds()):
+            if eid.IntegerValue in known_ids:
+                invalidate(doc)
+                return
+        # Only ids of the two categories reach the ElementType check.
+        for eid in args.GetAddedElementIds(_category_filter()):
+            if isinstance(doc.GetElement(eid), ElementType):
+                invalidate(doc)
+                return
+    except Exception:
+        # Never let a cache problem surface inside someone else's transaction.
+        invalidate()
+
+
+def _on_document_saved(sender, args):
+    """A save changes the version but not the types: keep the catalog current."""
+    try:
+        cached = (session.get(_CATALOG_KEY) or {}).get(session.doc_key(args.Document))
+        if cached is not None:
+            cached['version'] = session.document_version(args.Document)
+    except Exception:
+        invalidate()
+
+
+def _on_document_closing(sender, args):
+    try:
+        invalidate(args.Document)
+    except Exception:
+        invalidate()
+
+
+def _ensure_watcher(doc):
+    """Subscribes the invalidation handlers once per Revit session; False when that fails."""
+    if session.get(_WATCHER_KEY):
+        return True
+    try:
+        application = doc.Application
+        application.DocumentChanged += _on_document_changed
+        application.DocumentSaved += _on_document_saved
+        application.DocumentClosing += _on_document_closing
+    except Exception:
+        # Without a watcher the cache cannot be trusted, so do not keep it.
+        return False
+    session.set(_WATCHER_KEY, True)
+    return True
+
+
+# --- Presets ---
+# Presets are stored for the user rather than per project: UniqueIds (with the
+# display name as a fallback) resolve in every document built from the same
+# template, unlike the integer ids stored by older versions.
+
+def load_presets():
+    """Returns the stored presets as {name: {'conduit': (uid, name), 'fitting': (uid, name)}}."""
+    try:
+        presets = script.load_data(PRESETS_KEY, this_project=False)
+    except Exception:
+        presets = None
+    return dict(presets or {})
+
+
+def save_presets(presets):
+    """Stores the presets dictionary."""
+    script.store_data(PRESETS_KEY, presets, this_project=False)
+
+
+def load_active_preset():
+    """Returns the name of the preset that was saved or applied last."""
+    try:
+        return script.load_data(ACTIVE_PRESET_KEY, this_project=False)
+    except Exception:
+        return None
+
+
+def save_active_preset(name):
+    """Remembers name as the preset to offer first."""
+    script.store_data(ACTIVE_PRESET_KEY, name, this_project=False)
+
+
+def make_preset(doc, conduit_name, fitting_name):
+    """Builds a preset from two catalog display names."""
+    catalog = get_catalog(doc)
+    return {
+        CONDUIT: (catalog[CONDUIT][conduit_name][0], conduit_name),
+        FITTING: (catalog[FITTING][fitting_name][0], fitting_name),
+    }
+
+
+def load_legacy_pair():
+    """Returns the (conduit_id_int, fitting_id_int) pair stored by older versions, or None."""
+    try:
+        conduit_id = script.load_data(LEGACY_CONDUIT_ID_KEY)
+        fitting_id = script.load_data(LEGACY_FITTING_ID_KEY)
+    except Exception:
+        return None
+    if conduit_id and fitting_id:
+        return conduit_id, fitting_id
+    return None
+
+
+def _resolve_entry(doc, kind, entry):
+    unique_id, display_name = entry
+    elem_type = doc.GetElement(unique_id) if unique_id else None
+    if elem_type is not None:
+        return elem_type.Id
+    # Different document: fall back to the type with the same name.
+    match = get_catalog(doc)[kind].get(display_name)
+    if match is None:
+        return None
+    return ElementId(match[1])
+
+
+def resolve_preset(doc, preset):
+    """Returns (conduit_type_id, fitting_type_id) for preset in doc; missing types are None."""
+    return (_resolve_entry(doc, CONDUIT, preset[CONDUIT]),
+            _resolve_entry(doc, FITTING, preset[FITTING]))
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+Creation ledger: what one run of a button created, recorded as it is created.
+
+    ledger = creation_ledger.CreationLedger('Rooms to model', doc, view)
+    ledger.record(new_room.Id, creation_ledger.ROOM, source_id=456)
+    ledger.counts()                      # {'room': 1}
+    creation_ledger.select(uidoc, ledger, creation_ledger.ROOM)
+    creation_ledger.delete_run(doc, ledger)
+
+Each entry keeps the element's kind, the id it was copied from, the view
+and the view's phase, so reports need no extra API calls. Saved as JSON
+the ledger is an undo manifest: delete_run() removes exactly that run's
+elements with one doc.Delete call, leaving out ids that now hold an
+element of another kind. The last ledger of each document is
+also kept in the session.
+"""
+
+import datetime
+import json
+import uuid
+
+from Autodesk.Revit.DB import BuiltInCategory, BuiltInParameter, ElementId, SketchPlane
+from System.Collections.Generic import List as DotNetList
+
+from aatools import session, transactions
+
+ROOM = 'room'
+SEPARATOR = 'separator'
+SKETCH_PLANE = 'sketch_plane'
+
+MANIFEST_VERSION = 1
+
+_LAST_RUN_KEY = 'creation_ledger.last_run'
+
+_KIND_CATEGORIES = {
+    ROOM: BuiltInCategory.OST_Rooms,
+    SEPARATOR: BuiltInCategory.OST_RoomSeparationLines,
+}
+
+
+def view_phase_id(view):
+    """Integer id of the view's phase, or None for views without one."""
+    param = view.get_Parameter(BuiltInParameter.VIEW_PHASE) if view else None
+    if param is None or not param.HasValue:
+        return None
+    return param.AsElementId().IntegerValue
+
+
+class LedgerEntry(object):
+    __slots__ = ('element_id', 'kind', 'source_id', 'view_id', 'phase_id')
+
+    def __init__(self, element_id, kind, source_id=None, view_id=None, phase_id=None):
+        self.element_id = element_id
+        self.kind = kind
+        self.source_id = source_id
+        self.view_id = view_id
+        self.phase_id = phase_id
+
+    def to_list(self):
+        return [self.element_id, self.kind, self.source_id, self.view_id, self.phase_id]
+
+
+class CreationLedger(object):
+    """Entries of one run; view and phase default to the run's view."""
+
+    def __init__(self, name, doc=None, view=None, run_id=None, created=None, doc_key=None):
+        self.name = name
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.created = created or datetime.datetime.now().isoformat()
+        self.doc_key = doc_key or (session.doc_key(doc) if doc is not None else None)
+        self.view_id = view.Id.IntegerValue if view is not None else None
+        self.phase_id = view_phase_id(view)
+        self.entries = []
+
+    def record(self, element_id, kind, source_id=None, view_id=None, phase_id=None):
+        """Adds a created element; element_id may be an ElementId or an integer."""
+        if isinstance(element_id, ElementId):
+            element_id = element_id.IntegerValue
+        self.entries.append(LedgerEntry(
+            element_id, kind, source_id,
+            self.view_id if view_id is None else view_id,
+            self.phase_id if phase_id is None else phase_id))
+
+    def belongs_to(self, doc):
+        """True when the ledger was recorded in doc (manifests without a document match any)."""
+        return self.doc_key is None or self.doc_key == session.doc_key(doc)
+
+    def clear(self):
+        del self.entries[:]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def ids(self, *kinds):
+        """Integer ids of the created elements, optionally only of the given kinds."""
+        return [e.element_id for e in self.entries if not kinds or e.kind in kinds]
+
+    def element_ids(self, *kinds):
+        """The created ids as a .NET List[ElementId] for selection or deletion."""
+        return DotNetList[ElementId]([ElementId(i) for i in self.ids(*kinds)])
+
+    def counts(self):
+        """Number of created elements per kind."""
+        counts = {}
+        for entry in self.entries:
+            counts[entry.kind] = counts.get(entry.kind, 0) + 1
+        return counts
+
+    # --- Manifest ---
+
+    def to_dict(self):
+        return {'version': MANIFEST_VERSION, 'name': self.name, 'run_id': self.run_id,
+                'created': self.created, 'document': self.doc_key,
+                'view_id': self.view_id, 'phase_id': self.phase_id,
+                'entries': [e.to_list() for e in self.entries]}
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != MANIFEST_VERSION:
+            raise ValueError("Unsupported manifest version: {}".format(data.get('version')))
+        ledger = cls(data['name'], run_id=data['run_id'], created=data['created'],
+                     doc_key=data.get('document'))
+        ledger.view_id = data.get('view_id')
+        ledger.phase_id = data.get('phase_id')
+        ledger.entries = [LedgerEntry(*entry) for entry in data['entries']]
+        return ledger
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+
+# --- Session ---
+
+def remember(doc, ledger):
+    """Keeps ledger as the last run in doc for the rest of the session."""
+    runs = session.get(_LAST_RUN_KEY)
+    if runs is None:
+        runs = {}
+        session.set(_LAST_RUN_KEY, runs)
+    runs[session.doc_key(doc)] = ledger.to_dict()
+
+
+def last_run(doc):
+    """The last ledger remembered for doc, or None."""
+    data = (session.get(_LAST_RUN_KEY) or {}).get(session.doc_key(doc))
+    return CreationLedger.from_dict(data) if data else None
+
+
+def forget(doc, run_id=None):
+    """Drops the remembered ledger of doc (only if it is run_id, when given)."""
+    runs = session.get(_LAST_RUN_KEY) or {}
+    data = runs.get(session.doc_key(doc))
+    if data and (run_id is None or data['run_id'] == run_id):
+        del runs[session.doc_key(doc)]
+
+
+# --- Actions ---
+
+def select(uidoc, ledger, *kinds):
+    """Selects the elements of ledger, optionally only the given kinds; returns how many."""
+    element_ids = ledger.element_ids(*kinds)
+    uidoc.Selection.SetElementIds(element_ids)
+    return element_ids.Count
+
+
+def _is_kind(element, kind):
+    if kind == SKETCH_PLANE:
+        return isinstance(element, SketchPlane)
+    category = _KIND_CATEGORIES.get(kind)
+    return (category is not None and element.Category is not None
+            and element.Category.Id.IntegerValue == int(category))
+
+
+def check_run(doc, ledger):
+    """
+    Returns (present, mismatched) lists of ledger entries: elements that still
+    exist and are of their recorded kind, and ids that now hold another kind
+    of element. Ids that no longer exist are in neither list.
+    """
+    present = []
+    mismatched = []
+    for entry in ledger.entries:
+        element = doc.GetElement(ElementId(entry.element_id))
+        if element is None:
+            continue
+        (present if _is_kind(element, entry.kind) else mismatched).append(entry)
+    return present, mismatched
+
+
+def delete_run(doc, ledger, name=None):
+    """
+    Deletes the ledger's elements that still exist and match their recorded kind
+    with a single doc.Delete call. Returns (deleted_count, mismatched_entries);
+    the count includes dependent elements Revit deleted with them.
+    """
+    present, mismatched = check_run(doc, ledger)
+    if not present:
+        return 0, mismatched
+    ids = DotNetList[ElementId]([ElementId(entry.element_id) for entry in present])
+    with transactions.transaction(doc, name or "Undo {}".format(ledger.name)):
+        deleted = doc.Delete(ids)
+    forget(doc, ledger.run_id)
+    return len(list(deleted)), mismatched
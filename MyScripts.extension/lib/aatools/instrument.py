@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in phase timing and API call counting for the AATools buttons.
+
+Profiling is off unless 'instrumentation.json' in the extension's root
+directory contains {"enabled": true} or the AATOOLS_PROFILE environment
+variable is set to 1. While off, phase() hands back a shared no-op context
+manager and counted() returns the wrapped function itself, so instrumented
+code runs at full speed.
+
+    instrument.start('Bend 50')
+    with instrument.phase('collect') as p:
+        fittings = ...
+        p.count = len(fittings)
+    set_overrides = instrument.counted(view.SetElementOverrides, 'SetElementOverrides')
+    instrument.ready()      # right before the first dialog or window
+    instrument.finish()
+
+When enabled, finish() appends one JSON line per phase and per counter to
+a per-user log and prints a summary table in the pyRevit output window.
+All lines of one run share its 'run' id.
+
+Buttons call start() before their heavy imports, so the 'ready' phase is
+the click-to-ready latency. Every line is flagged 'cold' for the first run
+of a script in the Revit session and warm afterwards; dev/startup.py
+summarizes both.
+"""
+
+import datetime
+import functools
+import json
+import os
+import time
+import uuid
+
+from aatools import session, settings
+
+SETTINGS_FILE = 'instrumentation.json'
+LOG_FILE_NAME = 'aatools_perf.jsonl'
+_STARTED_KEY = 'instrument.started'
+
+_profiler = None
+
+
+class _NullPhase(object):
+    """Shared stand-in for phase() while profiling is disabled."""
+    count = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase(object):
+    def __init__(self, profiler, name, count):
+        self.profiler = profiler
+        self.name = name
+        self.count = count
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.profiler.add_record(self.name, self.count, time.time() - self._start,
+                                 failed=exc_type is not None)
+        return False
+
+
+class Profiler(object):
+    """Collects phase records and API call counters for one script run."""
+
+    def __init__(self, script_name, log_path, cold=False):
+        self.script_name = script_name
+        self.log_path = log_path
+        self.cold = cold
+        self.ready = False
+        self.records = []
+        self.calls = {}
+        self.call_time = {}
+        self.run_id = uuid.uuid4().hex[:12]
+        self._start = time.time()
+
+    def add_record(self, phase_name, count, duration, failed=False):
+        record = {'phase': phase_name, 'count': count, 'duration': round(duration, 6)}
+        if failed:
+            record['failed'] = True
+        self.records.append(record)
+
+    def add_calls(self, name, calls=1, duration=0.0):
+        self.calls[name] = self.calls.get(name, 0) + calls
+        self.call_time[name] = self.call_time.get(name, 0.0) + duration
+
+    def all_records(self):
+        records = list(self.records)
+        for name in sorted(self.calls):
+            records.append({'phase': 'api:' + name, 'count': self.calls[name],
+                            'duration': round(self.call_time[name], 6)})
+        records.append({'phase': 'total', 'count': None,
+                        'duration': round(time.time() - self._start, 6)})
+        return records
+
+
+def _read_enabled():
+    if os.environ.get('AATOOLS_PROFILE') == '1':
+        return True, None
+    try:
+        config = settings.load_json(SETTINGS_FILE, default={}) or {}
+    except Exception:
+        return False, None
+    return bool(config.get('enabled')), config.get('log_path')
+
+
+def default_log_path():
+    """Per-user log file next to pyRevit's own user data."""
+    base = os.environ.get('APPDATA') or os.path.expanduser('~')
+    return os.path.join(base, 'pyRevit', LOG_FILE_NAME)
+
+
+# --- Public API ---
+
+def _first_run(script_name):
+    """True the first time script_name starts in this Revit session."""
+    started = session.get(_STARTED_KEY)
+    if started is None:
+        started = {}
+        session.set(_STARTED_KEY, started)
+    first = script_name not in started
+    started[script_name] = started.get(script_name, 0) + 1
+    return first
+
+
+def start(script_name):
+    """Starts profiling a script run when instrumentation is enabled."""
+    global _profiler
+    cold = _first_run(script_name)
+    enabled, log_path = _read_enabled()
+    _profiler = Profiler(script_name, log_path or default_log_path(), cold) if enabled else None
+    return _profiler
+
+
+def enabled():
+    return _profiler is not None
+
+
+def phase(name, count=None):
+    """Times the with-block as one phase; set .count on the result to record an element count."""
+    if _profiler is None:
+        return _NULL_PHASE
+    return _Phase(_profiler, name, count)
+
+
+def timed(name=None):
+    """Decorator that records every call of the function as a phase."""
+    def decorator(func):
+        phase_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _profiler is None:
+                return func(*args, **kwargs)
+            with _Phase(_profiler, phase_name, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def counted(func, name):
+    """Returns func wrapped to count and time its calls, or func itself when disabled."""
+    profiler = _profiler
+    if profiler is None:
+        return func
+
+    def wrapper(*args, **kwargs):
+        call_start = time.time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.add_calls(name, 1, time.time() - call_start)
+    return wrapper
+
+
+def ready():
+    """Records the time since start() as the 'ready' phase; only the first call counts."""
+    profiler = _profiler
+    if profiler is None or profiler.ready:
+        return
+    profiler.ready = True
+    profiler.add_record('ready', None, time.time() - profiler._start)
+
+
+def finish(show_summary=True):
+    """Writes the collected records to the log and shows a summary."""
+    global _profiler
+    profiler = _profiler
+    _profiler = None
+    if profiler is None:
+        return None
+
+    records = profiler.all_records()
+    timestamp = datetime.datetime.now().isoformat()
+    try:
+        log_dir = os.path.dirname(profiler.log_path)
+        if log_dir and not os.path.isdir(log_dir):
+            os.makedirs(log_dir)
+        with open(profiler.log_path, 'a') as f:
+            for record in records:
+                line = dict(record, script=profiler.script_name, run=profiler.run_id,
+                            time=timestamp, cold=profiler.cold)
+                f.write(json.dumps(line, sort_keys=True) + '\n')
+    except Exception as e:
+        print('Could not write the instrumentation log.\nError: {}'.format(e))
+
+    if show_summary:
+        _print_summary(profiler.script_name, records)
+    return records
+
+
+def _print_summary(script_name, records):
+    try:
+        from pyrevit import script
+        output = script.get_output()
+    except Exception:
+        return
+    table = [[r['phase'], '' if r['count'] is None else r['count'],
+              '{:.1f}'.format(r['duration'] * 1000.0)] for r in records]
+    output.print_table(table_data=table,
+                       columns=['Phase', 'Elements / Calls', 'Time (ms)'],
+                       title='{} timing'.format(script_name))
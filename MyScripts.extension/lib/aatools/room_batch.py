@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Headless batch engine: turns exported room boundary files into creation plans.
+
+    python -m aatools.room_batch campus/*.aasnap -o plans.ndjson --offset 0 10 0 -j 8
+    python -m aatools.room_batch campus/*.aasnap -o new.ndjson --previous plans.ndjson
+
+Inputs are room snapshots (.aasnap, see room_snapshot) or room_geometry
+.json/.ndjson exports, read one floor at a time. Floors are processed on a
+pool of worker processes; snapshots are opened (memory-mapped) by the worker
+itself. Plans are written as NDJSON in input order as soon as they are
+ready, so memory use stays at a few floors per worker whatever the campus
+size. With --previous, floors whose content hash and offset match a plan
+in that file are not recomputed; the previous plan line is copied instead.
+Run from the extension's lib/ folder, or with it on PYTHONPATH.
+"""
+
+from __future__ import print_function
+
+import argparse
+import hashlib
+import itertools
+import json
+import sys
+
+from aatools import room_geometry, room_snapshot
+
+SNAPSHOT = 'snapshot'
+FLOOR_JSON = 'json'
+
+
+def _iter_floor_jobs(paths, offset):
+    """Yields (kind, payload, offset, source_file, source_hash) per floor."""
+    for path in paths:
+        if path.lower().endswith(room_snapshot.FILE_EXTENSION):
+            yield SNAPSHOT, path, offset, path, room_snapshot.read_hash(path)
+            continue
+        for floor in room_geometry.iter_floors(path):
+            floor_text = json.dumps(floor, sort_keys=True)
+            source_hash = hashlib.sha1(floor_text.encode('utf-8')).hexdigest()
+            yield FLOOR_JSON, floor_text, offset, path, source_hash
+
+
+def _plan_job(job):
+    kind, payload, offset, source_file, source_hash = job
+    if kind == SNAPSHOT:
+        with room_snapshot.RoomSnapshot(payload) as snapshot:
+            floor = snapshot.to_floor()
+    else:
+        floor = json.loads(payload)
+    plan = room_geometry.build_plan(floor, offset)
+    plan['source_file'] = source_file
+    plan['source_hash'] = source_hash
+    return json.dumps(plan, separators=(',', ':'))
+
+
+class PreviousPlans(object):
+    """Index of (source_hash, offset) -> line position in an earlier plan file."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._offsets = {}
+        position = 0
+        for line in self._file:
+            if line.strip():
+                plan = json.loads(line.decode('utf-8'))
+                if plan.get('source_hash'):
+                    self._offsets[(plan['source_hash'], tuple(plan['offset']))] = position
+            position += len(line)
+
+    def __contains__(self, key):
+        return key in self._offsets
+
+    def line(self, key):
+        self._file.seek(self._offsets[key])
+        return self._file.readline().decode('utf-8').rstrip('\r\n')
+
+    def close(self):
+        self._file.close()
+
+
+def run(paths, output, offset, workers=None, chunk_size=4, previous=None):
+    """
+    Writes one plan line per input floor to output.
+    Returns (floors_written, floors_reused_from_previous).
+    """
+    jobs = _iter_floor_jobs(paths, tuple(offset))
+    previous = previous or {}
+    pool = None
+    if workers == 1:
+        plan_map = lambda items: (_plan_job(item) for item in items)
+        window = chunk_size
+    else:
+        # Imported here: IronPython inside Revit has no multiprocessing.
+        from multiprocessing import Pool, cpu_count
+        workers = workers or cpu_count()
+        pool = Pool(processes=workers)
+        plan_map = lambda items: pool.imap(_plan_job, items, chunk_size)
+        # Pool.imap drains its input eagerly, so feed it a bounded window at a time.
+        window = workers * chunk_size * 2
+
+    count = reused = 0
+    try:
+        while True:
+            batch = list(itertools.islice(jobs, window))
+            if not batch:
+                break
+            results = plan_map([job for job in batch if (job[4], job[2]) not in previous])
+            for job in batch:
+                key = (job[4], job[2])
+                if key in previous:
+                    line = previous.line(key)
+                    reused += 1
+                else:
+                    line = next(results)
+                output.write(line + '\n')
+                count += 1
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return count, reused
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build room creation plans from exported boundaries.')
+    parser.add_argument('inputs', nargs='+', help='.aasnap snapshots or .json/.ndjson boundary exports')
+    parser.add_argument('-o', '--output', default='-', help='plan file (NDJSON), - for stdout')
+    parser.add_argument('--offset', nargs=3, type=float, default=[0.0, 0.0, 0.0],
+                        metavar=('DX', 'DY', 'DZ'), help='translation applied to the copies (feet)')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='worker processes (default: one per CPU, 1 to run in-process)')
+    parser.add_argument('--previous', help='earlier plan file; unchanged floors are copied from it')
+    args = parser.parse_args(argv)
+
+    previous = PreviousPlans(args.previous) if args.previous else None
+    try:
+        if args.output == '-':
+            count, reused = run(args.inputs, sys.stdout, args.offset, args.workers, previous=previous)
+        else:
+            with open(args.output, 'w') as output:
+                count, reused = run(args.inputs, output, args.offset, args.workers, previous=previous)
+    finally:
+        if previous is not None:
+            previous.close()
+    print('Planned {} floor(s), {} unchanged.'.format(count, reused), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Revit-independent room boundary processing used by 'Rooms to model'.
+
+Geometry is plain data so it can be exported, processed outside Revit and
+replayed. A point is an (x, y, z) tuple and a curve is a dict:
+
+    {"kind": "line", "points": [start, end]}
+    {"kind": "arc", "points": [start, end, point_on_arc]}
+    {"kind": "native", "ref": n}    # in-process only: n-th extracted Revit curve
+
+A floor (one view's worth of input) looks like:
+
+    {"floor": "Level 1", "document": "C:/Models/A.rvt", "view_id": 123,
+     "rooms": [{"id": 456, "point": [x, y, z], "loops": [[curve, ...], ...]}],
+     "separators": [curve, ...]}
+
+and build_plan() turns it into a creation plan:
+
+    {"floor": ..., "document": ..., "view_id": ..., "offset": [dx, dy, dz],
+     "rooms": [{"source_id": 456, "point": [x, y, z]}],
+     "separators": [curve, ...]}
+
+Plan separators carry the "source_id" of the room whose boundary they
+follow; standalone separators keep the "source_id" of their curve, if any.
+"document" is the exporting model's session.doc_key(); together with
+"view_id" it tells which view a plan belongs to.
+
+Separators are listed in creation order: room boundaries first (lines
+de-duplicated by fingerprint, other curves always kept), then standalone
+line separators that are not already covered.
+"""
+
+import json
+
+TOLERANCE = 1e-9
+FINGERPRINT_PRECISION = 4
+
+LINE = 'line'
+ARC = 'arc'
+NATIVE = 'native'
+
+
+# --- Curves ---
+
+def make_line(start, end):
+    return {'kind': LINE, 'points': [tuple(start), tuple(end)]}
+
+
+def _almost_equal(a, b, tolerance=TOLERANCE):
+    return (abs(a[0] - b[0]) <= tolerance and abs(a[1] - b[1]) <= tolerance
+            and abs(a[2] - b[2]) <= tolerance)
+
+
+def _direction(curve):
+    start, end = curve['points'][0], curve['points'][1]
+    dx, dy, dz = end[0] - start[0], end[1] - start[1], end[2] - start[2]
+    length = (dx * dx + dy * dy + dz * dz) ** 0.5
+    if not length:
+        return (0.0, 0.0, 0.0)
+    return (dx / length, dy / length, dz / length)
+
+
+def translate_point(point, offset):
+    return (point[0] + offset[0], point[1] + offset[1], point[2] + offset[2])
+
+
+def translate_curve(curve, offset):
+    """Returns curve moved by offset; native curves keep their reference and record the offset."""
+    if curve['kind'] == NATIVE:
+        return dict(curve, offset=tuple(offset))
+    return dict(curve, points=[translate_point(p, offset) for p in curve['points']])
+
+
+def merge_collinear_lines(curves):
+    """Merges adjacent, collinear, touching lines of a contiguous loop."""
+    merged_curves = []
+    index = 0
+    count = len(curves)
+    while index < count:
+        current = curves[index]
+        index += 1
+        if current['kind'] != LINE:
+            merged_curves.append(current)
+            continue
+        direction = _direction(current)
+        while index < count:
+            next_curve = curves[index]
+            if (next_curve['kind'] == LINE
+                    and _almost_equal(direction, _direction(next_curve))
+                    and _almost_equal(current['points'][1], next_curve['points'][0])):
+                current = make_line(current['points'][0], next_curve['points'][1])
+                index += 1
+            else:
+                break
+        merged_curves.append(current)
+    return merged_curves
+
+
+def line_fingerprint(curve, precision=FINGERPRINT_PRECISION):
+    """Creates a unique, order-independent string for a line's 2D geometry."""
+    p1, p2 = curve['points'][0], curve['points'][1]
+    # Adding 0.0 turns a rounded -0.0 into 0.0, which prints the same as its neighbours.
+    pt1_tuple = (round(p1[0], precision) + 0.0, round(p1[1], precision) + 0.0)
+    pt2_tuple = (round(p2[0], precision) + 0.0, round(p2[1], precision) + 0.0)
+    sorted_points = sorted([pt1_tuple, pt2_tuple])
+    return "{};{}".format(sorted_points[0], sorted_points[1])
+
+
+# --- Plans ---
+
+def build_plan(floor, offset):
+    """Builds the creation plan for one floor moved by offset (dx, dy, dz)."""
+    offset = tuple(offset)
+    plan_rooms = []
+    plan_separators = []
+    fingerprints = set()
+
+    for room in floor.get('rooms', []):
+        plan_rooms.append({'source_id': room['id'],
+                           'point': translate_point(room['point'], offset)})
+        for loop in room.get('loops', []):
+            moved = [translate_curve(c, offset) for c in loop]
+            for curve in merge_collinear_lines(moved):
+                if curve['kind'] == LINE:
+                    fingerprint = line_fingerprint(curve)
+                    if fingerprint in fingerprints:
+                        continue
+                    fingerprints.add(fingerprint)
+                plan_separators.append(dict(curve, source_id=room['id']))
+
+    for separator in floor.get('separators', []):
+        if separator['kind'] != LINE:
+            continue
+        curve = translate_curve(separator, offset)
+        fingerprint = line_fingerprint(curve)
+        if fingerprint not in fingerprints:
+            fingerprints.add(fingerprint)
+            plan_separators.append(curve)
+
+    return {'floor': floor.get('floor'), 'document': floor.get('document'),
+            'view_id': floor.get('view_id'), 'offset': list(offset), 'rooms': plan_rooms, 'separators': plan_separators}
+
+
+# --- Files ---
+
+def iter_floors(path):
+    """
+    Yields the floors of an export file one at a time. '.ndjson' files hold
+    one floor per line; '.json' files hold one floor or a list of floors.
+    """
+    if path.lower().endswith('.ndjson'):
+        with open(path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    with open(path, 'r') as f:
+        data = json.load(f)
+    for floor in (data if isinstance(data, list) else [data]):
+        yield floor
+
+
+def write_ndjson(stream, record):
+    """Writes record as one compact JSON line."""
+    stream.write(json.dumps(record, separators=(',', ':')) + '\n')
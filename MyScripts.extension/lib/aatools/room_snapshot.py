@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+"""
+Compact, versioned binary snapshots of one view's room boundary geometry.
+
+A snapshot holds the same data as a room_geometry floor, in flat typed
+buffers instead of nested Python objects:
+
+    header      magic, version, SHA-1 of the payload, section counts
+    room_ids    'd'  one per room (exact for ids below 2**53)
+    separator_ids 'd'  source id per standalone separator, -1 for none
+    room_points 'd'  x, y, z per room
+    room_loops  'i'  n_rooms + 1 offsets into the loop table
+    loop_curves 'i'  n_loops + 1 offsets into the curve table
+    curve_pts   'i'  n_curves + 1 offsets into the point table
+    curve_kinds 'b'  KIND_LINE / KIND_ARC per curve
+    coords      'd'  x, y, z per point
+    meta        UTF-8 JSON: floor name, document, view id
+    parameters  UTF-8 JSON: {"columns": [...], "rows": [[...], ...]}
+
+Room boundary curves come first in the curve table, standalone separators
+last. Every section starts on an 8-byte boundary and numbers are little
+endian. RoomSnapshot memory-maps the file and exposes the sections as
+memoryviews, so opening a snapshot reads only the header and the JSON
+blocks. Python 2 cannot view an mmap; there each section is copied into
+an array instead. The payload hash lets callers skip views whose geometry did not
+change since the last snapshot.
+"""
+
+import array
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from aatools import room_geometry
+
+MAGIC = b'AARS'
+VERSION = 2
+FILE_EXTENSION = '.aasnap'
+
+KIND_LINE = 0
+KIND_ARC = 1
+_KIND_CODES = {room_geometry.LINE: KIND_LINE, room_geometry.ARC: KIND_ARC}
+_KIND_NAMES = {KIND_LINE: room_geometry.LINE, KIND_ARC: room_geometry.ARC}
+
+# magic, version, flags, payload sha1, rooms, loops, curves, points,
+# separator curves, meta bytes, parameter bytes
+_HEADER = struct.Struct('<4sHH20sIIIIIII')
+
+_SECTIONS = (
+    ('room_ids', 'd'),
+    ('separator_ids', 'd'),
+    ('room_points', 'd'),
+    ('room_loops', 'i'),
+    ('loop_curves', 'i'),
+    ('curve_pts', 'i'),
+    ('curve_kinds', 'b'),
+    ('coords', 'd'),
+)
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _padding(size):
+    return (-size) % 8
+
+
+_NO_SOURCE = -1
+
+
+def _section_lengths(n_rooms, n_loops, n_curves, n_points, n_separators):
+    return {
+        'room_ids': n_rooms,
+        'separator_ids': n_separators,
+        'room_points': n_rooms * 3,
+        'room_loops': n_rooms + 1,
+        'loop_curves': n_loops + 1,
+        'curve_pts': n_curves + 1,
+        'curve_kinds': n_curves,
+        'coords': n_points * 3,
+    }
+
+
+def _to_bytes(arr):
+    if sys.byteorder != 'little':
+        arr = array.array(arr.typecode, arr)
+        arr.byteswap()
+    try:
+        return arr.tobytes()
+    except AttributeError:
+        return arr.tostring()
+
+
+# --- Writing ---
+
+class _Builder(object):
+    def __init__(self):
+        self.room_loops = array.array('i', [0])
+        self.loop_curves = array.array('i', [0])
+        self.curve_pts = array.array('i', [0])
+        self.curve_kinds = array.array('b')
+        self.coords = array.array('d')
+
+    def add_curve(self, curve):
+        kind = _KIND_CODES.get(curve['kind'])
+        if kind is None:
+            raise SnapshotError("Curves of kind '{}' cannot be stored in a snapshot.".format(curve['kind']))
+        self.curve_kinds.append(kind)
+        for point in curve['points']:
+            self.coords.extend(point)
+        self.curve_pts.append(len(self.coords) // 3)
+
+
+def _parameter_table(rooms):
+    # Sorted columns keep the payload hash independent of parameter order.
+    names = set()
+    for room in rooms:
+        names.update(room.get('parameters', {}))
+    columns = sorted(names)
+    rows = []
+    for room in rooms:
+        values = room.get('parameters', {})
+        rows.append([values.get(name) for name in columns])
+    return {'columns': columns, 'rows': rows}
+
+
+def build_payload(floor):
+    """Encodes a room_geometry floor; returns (counts, payload_bytes)."""
+    rooms = floor.get('rooms', [])
+    builder = _Builder()
+    room_ids = array.array('d')
+    room_points = array.array('d')
+    for room in rooms:
+        room_ids.append(room['id'])
+        room_points.extend(room['point'])
+        for loop in room.get('loops', []):
+            for curve in loop:
+                builder.add_curve(curve)
+            builder.loop_curves.append(len(builder.curve_kinds))
+        builder.room_loops.append(len(builder.loop_curves) - 1)
+    separators = floor.get('separators', [])
+    separator_ids = array.array('d')
+    for curve in separators:
+        builder.add_curve(curve)
+        source_id = curve.get('source_id')
+        separator_ids.append(_NO_SOURCE if source_id is None else source_id)
+
+    sections = {
+        'room_ids': room_ids,
+        'separator_ids': separator_ids,
+        'room_points': room_points,
+        'room_loops': builder.room_loops,
+        'loop_curves': builder.loop_curves,
+        'curve_pts': builder.curve_pts,
+        'curve_kinds': builder.curve_kinds,
+        'coords': builder.coords,
+    }
+    meta = json.dumps({'floor': floor.get('floor'), 'document': floor.get('document'),
+                       'view_id': floor.get('view_id')}, sort_keys=True).encode('utf-8')
+    parameters = json.dumps(_parameter_table(rooms), separators=(',', ':'),
+                            sort_keys=True).encode('utf-8')
+
+    chunks = []
+    for name, _typecode in _SECTIONS:
+        data = _to_bytes(sections[name])
+        chunks.append(data)
+        chunks.append(b'\0' * _padding(len(data)))
+    chunks.append(meta)
+    chunks.append(parameters)
+
+    counts = (len(rooms), len(builder.loop_curves) - 1, len(builder.curve_kinds),
+              len(builder.coords) // 3, len(separators), len(meta), len(parameters))
+    return counts, b''.join(chunks)
+
+
+def read_hash(path):
+    """Returns the payload hash stored in a snapshot's header, or None if unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+        return _parse_header(header)[3]
+    except (IOError, OSError, SnapshotError):
+        return None
+
+
+def write_snapshot(path, floor, force=False):
+    """
+    Writes floor to path and returns (content_hash, written). When the file
+    already holds the same content it is left untouched and written is False.
+    """
+    counts, payload = build_payload(floor)
+    digest = hashlib.sha1(payload).hexdigest()
+    if not force and read_hash(path) == digest:
+        return digest, False
+    header = _HEADER.pack(MAGIC, VERSION, 0, bytes(bytearray.fromhex(digest)), *counts)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(payload)
+    if os.path.exists(path):
+        os.remove(path)
+    os.rename(tmp_path, path)
+    return digest, True
+
+
+# --- Reading ---
+
+def _parse_header(header):
+    if len(header) < _HEADER.size:
+        raise SnapshotError("File is too short to be a room snapshot.")
+    fields = _HEADER.unpack(header[:_HEADER.size])
+    if fields[0] != MAGIC:
+        raise SnapshotError("Not a room snapshot file.")
+    if fields[1] != VERSION:
+        raise SnapshotError("Unsupported room snapshot version {}.".format(fields[1]))
+    digest = ''.join('{:02x}'.format(b) for b in bytearray(fields[3]))
+    return fields[1], fields[2], fields[4:], digest
+
+
+def _typed_view(buf, offset, typecode, count):
+    size = array.array(typecode).itemsize * count
+    chunk = buf[offset:offset + size]
+    if sys.byteorder == 'little':
+        try:
+            return chunk.cast(typecode)
+        except (AttributeError, TypeError):
+            pass
+    # No zero-copy cast available (Python 2 / IronPython) or big endian host.
+    arr = array.array(typecode)
+    data = bytes(chunk)
+    try:
+        arr.frombytes(data)
+    except AttributeError:
+        arr.fromstring(data)
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr
+
+
+class RoomSnapshot(object):
+    """Read-only, memory-mapped view of a snapshot file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):
+            raise SnapshotError("Empty or unreadable snapshot file: {}".format(path))
+        try:
+            self._buf = memoryview(self._map)
+        except TypeError:
+            # Python 2 cannot take a memoryview of an mmap; slices are copied instead.
+            self._buf = self._map
+        _version, _flags, counts, self.content_hash = _parse_header(self._map[:_HEADER.size])
+        (self.room_count, self.loop_count, self.curve_count, self.point_count,
+         self.separator_count, meta_size, parameters_size) = counts
+
+        lengths = _section_lengths(self.room_count, self.loop_count, self.curve_count,
+                                   self.point_count, self.separator_count)
+        offset = _HEADER.size
+        for name, typecode in _SECTIONS:
+            setattr(self, name, _typed_view(self._buf, offset, typecode, lengths[name]))
+            size = array.array(typecode).itemsize * lengths[name]
+            offset += size + _padding(size)
+        self.meta = json.loads(bytes(self._buf[offset:offset + meta_size]).decode('utf-8'))
+        offset += meta_size
+        self._parameters_span = (offset, offset + parameters_size)
+        self._parameters = None
+
+    # --- Lifetime ---
+
+    def close(self):
+        for name, _typecode in _SECTIONS:
+            view = getattr(self, name, None)
+            if isinstance(view, memoryview):
+                view.release()
+            setattr(self, name, None)
+        if self._buf is not None:
+            if isinstance(self._buf, memoryview):
+                self._buf.release()
+            self._buf = None
+            self._map.close()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        return False
+
+    # --- Access ---
+
+    @property
+    def parameters(self):
+        """The room parameter table, decoded on first use."""
+        if self._parameters is None:
+            start, end = self._parameters_span
+            self._parameters = json.loads(bytes(self._buf[start:end]).decode('utf-8'))
+        return self._parameters
+
+    def point(self, index):
+        coords = self.coords
+        return (coords[index * 3], coords[index * 3 + 1], coords[index * 3 + 2])
+
+    def curve(self, index):
+        first, last = self.curve_pts[index], self.curve_pts[index + 1]
+        return {'kind': _KIND_NAMES[self.curve_kinds[index]],
+                'points': [self.point(p) for p in range(first, last)]}
+
+    def room_id(self, index):
+        return int(self.room_ids[index])
+
+    def room_point(self, index):
+        points = self.room_points
+        return (points[index * 3], points[index * 3 + 1], points[index * 3 + 2])
+
+    def room_loops_of(self, index):
+        """Yields the boundary loops of the index-th room as lists of curves."""
+        for loop in range(self.room_loops[index], self.room_loops[index + 1]):
+            yield [self.curve(c) for c in range(self.loop_curves[loop], self.loop_curves[loop + 1])]
+
+    def separators(self):
+        first = self.curve_count - self.separator_count
+        for index in range(first, self.curve_count):
+            curve = self.curve(index)
+            source_id = self.separator_ids[index - first]
+            if source_id != _NO_SOURCE:
+                curve['source_id'] = int(source_id)
+            yield curve
+
+    def to_floor(self, include_parameters=False):
+        """Decodes the snapshot into a room_geometry floor."""
+        rooms = []
+        table = self.parameters if include_parameters else None
+        for index in range(self.room_count):
+            room = {'id': self.room_id(index), 'point': self.room_point(index),
+                    'loops': list(self.room_loops_of(index))}
+            if table is not None:
+                room['parameters'] = dict(zip(table['columns'], table['rows'][index]))
+            rooms.append(room)
+        return {'floor': self.meta.get('floor'), 'document': self.meta.get('document'),
+                'view_id': self.meta.get('view_id'),
+                'rooms': rooms, 'separators': list(self.separators())}
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Session-wide storage that survives between button clicks.
+
+pyRevit runs every click in a fresh engine, so module-level caches are lost.
+Values kept here live in the Revit AppDomain until Revit is closed. Only store
+plain data (dicts, lists, tuples, strings, numbers) or .NET objects. Never
+store instances of classes defined in a script module: they belong to the
+engine that created them, which pyRevit discards after the click.
+
+The one exception is a script that sets __persistentengine__, whose engine
+outlives the click. 'Change parameters' relies on this to keep its open
+ParameterEditorWindow under 'ParameterEditor.window'; it must stay the only
+reader of that key.
+"""
+
+_SLOT = 'AATools.Session'
+
+# Used when running outside of Revit (no .NET AppDomain available).
+_fallback_store = {}
+
+
+def _store():
+    """Returns the dictionary shared by all clicks of this Revit session."""
+    try:
+        from System import AppDomain
+    except ImportError:
+        return _fallback_store
+    domain = AppDomain.CurrentDomain
+    store = domain.GetData(_SLOT)
+    if store is None:
+        store = {}
+        domain.SetData(_SLOT, store)
+    return store
+
+
+def get(key, default=None):
+    """Returns the session value stored under key."""
+    return _store().get(key, default)
+
+
+def set(key, value):
+    """Stores value under key for the rest of the session."""
+    _store()[key] = value
+
+
+def pop(key, default=None):
+    """Removes and returns the session value stored under key."""
+    return _store().pop(key, default)
+
+
+def doc_key(doc):
+    """Returns a stable key identifying an open document."""
+    return doc.PathName or doc.Title
+
+
+def document_version(doc):
+    """(VersionGUID, NumberOfSaves) of doc, or None before Revit 2021."""
+    from Autodesk.Revit.DB import Document
+    get_version = getattr(Document, 'GetDocumentVersion', None)
+    if get_version is None:
+        return None
+    try:
+        version = get_version(doc)
+    except Exception:
+        return None
+    return (str(version.VersionGUID), version.NumberOfSaves)
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Locates settings files stored in the extension's root directory.
+"""
+
+import json
+import os
+
+
+def find_extension_dir(start_path=None):
+    """Walks up from start_path (this module by default) to the '.extension' directory."""
+    current_path = os.path.abspath(start_path or os.path.dirname(__file__))
+    while not current_path.lower().endswith('.extension'):
+        parent_path = os.path.dirname(current_path)
+        if parent_path == current_path:
+            raise Exception("Could not find the .extension directory.")
+        current_path = parent_path
+    return current_path
+
+
+def settings_path(file_name):
+    """Returns the full path of a settings file in the extension's root directory."""
+    return os.path.join(find_extension_dir(), file_name)
+
+
+def load_json(file_name, default=None):
+    """Reads a JSON settings file, returning default when it is missing."""
+    path = settings_path(file_name)
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r') as f:
+        return json.load(f)
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Shared transaction runner for the AATools buttons.
+
+run_items() applies an action to every item and returns a RunLog with one
+outcome per item:
+
+    log = transactions.run_items(doc, 'Apply Types', elements, change_type)
+    if log.failed:
+        forms.alert(log.summary())
+
+The action returns SKIPPED when an item needs no change and raises to mark
+it failed; anything else counts as ok. Items are committed in chunks of
+chunk_size inside one TransactionGroup, so the whole run is still a single
+undo step. isolate=True wraps each item in a SubTransaction so that a failing
+item leaves no partial changes behind. Every transaction installs a
+failures preprocessor that deletes the known bulk-edit warnings (rooms not
+enclosed, overlapping separators, duplicate instances), so no blocking
+dialogs appear.
+"""
+
+from contextlib import contextmanager
+
+from Autodesk.Revit.DB import (
+    BuiltInFailures,
+    FailureProcessingResult,
+    FailureSeverity,
+    IFailuresPreprocessor,
+    SubTransaction,
+    Transaction,
+    TransactionGroup,
+    TransactionStatus,
+)
+
+OK = 'ok'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+
+_KNOWN_WARNING_NAMES = (
+    ('RoomFailures', 'RoomNotEnclosed'),
+    ('RoomFailures', 'RoomsInSameRegion'),
+    ('OverlapFailures', 'RoomSeparationLinesOverlap'),
+    ('OverlapFailures', 'LinesOverlap'),
+    ('OverlapFailures', 'DuplicateInstances'),
+)
+
+
+def _known_warnings():
+    """FailureDefinitionIds of the warnings deleted by default; names missing in this Revit version are ignored."""
+    failure_ids = []
+    for group_name, failure_name in _KNOWN_WARNING_NAMES:
+        group = getattr(BuiltInFailures, group_name, None)
+        failure_id = getattr(group, failure_name, None) if group is not None else None
+        if failure_id is not None:
+            failure_ids.append(failure_id)
+    return failure_ids
+
+
+KNOWN_WARNINGS = _known_warnings()
+
+
+class WarningSwallower(IFailuresPreprocessor):
+    """Deletes the given warnings (or every warning) before Revit shows them."""
+
+    def __init__(self, failure_ids=None, delete_all_warnings=False):
+        # Compared by Guid: FailureDefinitionId instances are not reused by Revit.
+        self.failure_guids = set(f.Guid for f in (KNOWN_WARNINGS if failure_ids is None else failure_ids))
+        self.delete_all_warnings = delete_all_warnings
+        self.deleted = 0
+
+    def PreprocessFailures(self, failures_accessor):
+        for message in failures_accessor.GetFailureMessages():
+            if message.GetSeverity() != FailureSeverity.Warning:
+                continue
+            if self.delete_all_warnings or message.GetFailureDefinitionId().Guid in self.failure_guids:
+                failures_accessor.DeleteWarning(message)
+                self.deleted += 1
+        return FailureProcessingResult.Continue
+
+
+def _install_preprocessor(transaction, preprocessor):
+    options = transaction.GetFailureHandlingOptions()
+    options.SetFailuresPreprocessor(preprocessor)
+    transaction.SetFailureHandlingOptions(options)
+
+
+# --- Outcome log ---
+
+class ItemOutcome(object):
+    __slots__ = ('item_id', 'status', 'message')
+
+    def __init__(self, item_id, status, message=None):
+        self.item_id = item_id
+        self.status = status
+        self.message = message
+
+
+class RunLog(object):
+    """Per-item outcomes of one run_items() call."""
+
+    def __init__(self, name):
+        self.name = name
+        self.outcomes = []
+        self.transactions = 0
+        self.deleted_warnings = 0
+
+    def _with_status(self, status):
+        return [o for o in self.outcomes if o.status == status]
+
+    @property
+    def ok(self):
+        return self._with_status(OK)
+
+    @property
+    def skipped(self):
+        return self._with_status(SKIPPED)
+
+    @property
+    def failed(self):
+        return self._with_status(FAILED)
+
+    def summary(self, max_failures=10):
+        lines = ["{}: {} done, {} skipped, {} failed.".format(
+            self.name, len(self.ok), len(self.skipped), len(self.failed))]
+        for outcome in self.failed[:max_failures]:
+            label = outcome.item_id
+            if isinstance(label, int):
+                label = "Element {}".format(label)
+            lines.append("{}: {}".format(label, outcome.message))
+        if len(self.failed) > max_failures:
+            lines.append("... and {} more.".format(len(self.failed) - max_failures))
+        return "\n".join(lines)
+
+
+# --- Runners ---
+
+@contextmanager
+def transaction(doc, name, failure_ids=None, delete_all_warnings=False):
+    """A single Transaction with the warning preprocessor; rolled back if the block raises."""
+    t = Transaction(doc, name)
+    _install_preprocessor(t, WarningSwallower(failure_ids, delete_all_warnings))
+    t.Start()
+    try:
+        yield t
+    except Exception:
+        if _is_open(t):
+            t.RollBack()
+        raise
+    if _is_open(t):
+        t.Commit()
+
+
+def _is_open(t):
+    # HasStarted() stays true after Commit/RollBack; only the status tells.
+    return t.GetStatus() == TransactionStatus.Started
+
+
+def _default_item_id(item):
+    element_id = getattr(item, 'Id', None)
+    return element_id.IntegerValue if element_id is not None else item
+
+
+def _run_item(doc, item, action, isolate, item_id):
+    key = item_id(item)
+    sub = SubTransaction(doc) if isolate else None
+    try:
+        if sub is not None:
+            sub.Start()
+        result = action(item)
+        if sub is not None:
+            sub.Commit()
+    except Exception as e:
+        if sub is not None and _is_open(sub):
+            sub.RollBack()
+        return ItemOutcome(key, FAILED, str(e))
+    return ItemOutcome(key, SKIPPED if result == SKIPPED else OK)
+
+
+def run_items(doc, name, items, action, chunk_size=None, isolate=False,
+              failure_ids=None, delete_all_warnings=False, item_id=None, prepare=None):
+    """
+    Runs action(item) for every item and returns a RunLog.
+    prepare() runs inside the first transaction, before any item.
+    """
+    items = list(items)
+    item_id = item_id or _default_item_id
+    if chunk_size:
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)] or [[]]
+    else:
+        chunks = [items]
+
+    log = RunLog(name)
+    preprocessor = WarningSwallower(failure_ids, delete_all_warnings)
+    group = None
+    if len(chunks) > 1:
+        group = TransactionGroup(doc, name)
+        group.Start()
+
+    try:
+        for index, chunk in enumerate(chunks):
+            title = name if group is None else "{} ({}/{})".format(name, index + 1, len(chunks))
+            t = Transaction(doc, title)
+            _install_preprocessor(t, preprocessor)
+            t.Start()
+            try:
+                if prepare is not None and index == 0:
+                    prepare()
+                outcomes = [_run_item(doc, item, action, isolate, item_id) for item in chunk]
+                status = t.Commit()
+            except Exception:
+                if _is_open(t):
+                    t.RollBack()
+                raise
+            log.transactions += 1
+            if status != TransactionStatus.Committed:
+                for outcome in outcomes:
+                    if outcome.status == OK:
+                        outcome.status = FAILED
+                        outcome.message = "The transaction was rolled back by Revit."
+            log.outcomes.extend(outcomes)
+        if group is not None:
+            group.Assimilate()
+    except Exception:
+        if group is not None and _is_open(group):
+            group.RollBack()
+        raise
+
+    log.deleted_warnings = preprocessor.deleted
+    return log
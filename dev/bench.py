@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks the AATools button scripts against synthetic models, offline.
+
+    python dev/bench.py                         # every case at 1k/10k/100k
+    python dev/bench.py -s 1000 10000 -c bend_50 rooms_to_model
+    python dev/bench.py --save baseline.json
+    python dev/bench.py --compare baseline.json --threshold 1.25
+    python -m pytest dev                        # every case once, with its checks
+
+The real scripts run unchanged on top of the fakerevit stand-in. Only the
+script run is timed; building the model and any preparation runs are not.
+After each run the case checks the result (alerts, changed elements), so a
+script that stops early fails the benchmark instead of looking fast.
+With --compare, the exit code is 1 when a case got slower than threshold
+times its baseline median.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fakerevit import db, dotnet, install, models  # noqa: E402
+
+PANEL = 'MyScripts.extension/AATools.tab/'
+ISOLATE = PANEL + 'Visual.panel/halftone all.pushbutton/script.py'
+ROOMS_TO_MODEL = PANEL + 'Links.panel/Rooms to model.pushbutton/script.py'
+SET_TYPES = PANEL + 'Conduits.panel/Set Types.pushbutton/script.py'
+TYPES_APPLY = PANEL + 'Conduits.panel/Types Apply.pushbutton/script.py'
+BEND_50 = PANEL + 'Conduits.panel/Bend 50.pushbutton/script.py'
+QUANTITIES = PANEL + 'Conduits.panel/Quantities.pushbutton/script.py'
+PARAMETER_EDITOR = PANEL + 'Parameters.panel/Change parameters.pushbutton/script.py'
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+# --- Cases ---
+# Each case prepares a model for `size` elements and returns (run, check):
+# the callable to time and one that asserts what the run should have done,
+# so a script that stops early or changes nothing fails instead of looking fast.
+
+def _expect_alerts(fake, *alerts):
+    assert fake.last_exit is None, 'script exited: {}'.format(fake.last_exit)
+    assert fake.forms.alerts == list(alerts), fake.forms.alerts
+
+
+def _of_category(doc, category):
+    return list(db.FilteredElementCollector(doc).OfCategory(category).WhereElementIsNotElementType())
+
+
+def _radius(doc, fitting):
+    from aatools.bend_radius import find_radius_param
+    param = find_radius_param(fitting, writable=False)
+    if param is None:
+        param = find_radius_param(doc.GetElement(fitting.GetTypeId()), writable=False)
+    return param.AsDouble()
+
+
+def _type_name(doc, element):
+    return doc.GetElement(element.GetTypeId()).Name
+
+
+def _isolate(fake, size):
+    doc, info = models.build_view_model(size)
+    selected = info['elements'][:max(1, size // 10)]
+    fake.load(doc, selected)
+    return doc, info['elements'], set(e.Id for e in selected)
+
+
+def case_isolate(fake, size):
+    doc, elements, selected = _isolate(fake, size)
+
+    def check():
+        _expect_alerts(fake)
+        for element in elements:
+            overrides = doc.ActiveView.GetElementOverrides(element.Id)
+            assert overrides.Halftone == (element.Id not in selected), element.Id
+    return lambda: fake.run_script(ISOLATE), check
+
+
+def case_isolate_clear(fake, size):
+    doc, elements, _selected = _isolate(fake, size)
+    fake.run_script(ISOLATE)
+    fake.select([])
+
+    def check():
+        _expect_alerts(fake)
+        for element in elements:
+            overrides = doc.ActiveView.GetElementOverrides(element.Id)
+            assert not (overrides.Halftone or overrides.Transparency), element.Id
+    return lambda: fake.run_script(ISOLATE), check
+
+
+def _boundary_edges(info):
+    """Distinct room sides plus the standalone separators, the lines one run should create."""
+    edges = set()
+    for room in info['rooms']:
+        points = [segment.GetCurve().GetEndPoint(0) for segment in room.boundary[0]]
+        xs = sorted(set(round(p.X, 6) for p in points))
+        ys = sorted(set(round(p.Y, 6) for p in points))
+        (x0, x1), (y0, y1) = (xs[0], xs[-1]), (ys[0], ys[-1])
+        corners = [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+        edges.update(frozenset((corners[c], corners[(c + 1) % 4])) for c in range(4))
+    return len(edges) + len(info['separators'])
+
+
+def case_rooms_to_model(fake, size):
+    doc, info = models.build_room_model(size)
+    fake.load(doc)
+    fake.forms.responses['ask_for_string'] = '200.0'
+    rooms = len(_of_category(doc, db.BuiltInCategory.OST_Rooms))
+    separators = len(_of_category(doc, db.BuiltInCategory.OST_RoomSeparationLines))
+    expected = _boundary_edges(info)
+
+    def check():
+        _expect_alerts(fake, 'Successfully created {} new rooms and {} new separator lines.'.format(
+            size, expected))
+        assert len(_of_category(doc, db.BuiltInCategory.OST_Rooms)) == rooms + size
+        assert len(_of_category(doc, db.BuiltInCategory.OST_RoomSeparationLines)) == separators + expected
+    return lambda: fake.run_script(ROOMS_TO_MODEL), check
+
+
+def _set_last_types(fake):
+    fake.forms.responses['SelectFromList'] = lambda items: items[-1]
+    fake.run_script(SET_TYPES)
+    assert fake.last_exit is None, 'Set Types exited: {}'.format(fake.last_exit)
+
+
+def case_types_apply(fake, size):
+    doc, info = models.build_conduit_model(size // 2)
+    fake.load(doc)
+    _set_last_types(fake)
+    fake.select(info['conduits'] + info['fittings'])
+
+    def check():
+        _expect_alerts(fake)
+        for kind in ('conduits', 'fittings'):
+            type_ids = set(e.GetTypeId() for e in info[kind])
+            assert len(type_ids) == 1, '{} keep {} types'.format(kind, len(type_ids))
+    return lambda: fake.run_script(TYPES_APPLY), check
+
+
+def case_bend_50(fake, size):
+    doc, info = models.build_conduit_model(size)
+    fake.load(doc, info['fittings'])
+
+    def check():
+        _expect_alerts(fake)
+        for fitting in info['fittings']:
+            assert abs(_radius(doc, fitting) - 50.0 / 12.0) < 1e-9, fitting.Id
+    return lambda: fake.run_script(BEND_50), check
+
+
+def case_bend_50_model(fake, size):
+    doc, info = models.build_conduit_model(size)
+    fake.load(doc)
+
+    def check():
+        from aatools import bend_rules
+        table = bend_rules.load_rules()
+        on_instance = sum(1 for f in info['fittings'] if f.LookupParameter('Bend Radius') is not None)
+        _expect_alerts(fake, fake.forms.alerts[0], 'Changed: {}\nChanged through type: {}\n'
+                       'Skipped (no radius): 0\nFailed: 0\nNo matching rule: 0'.format(
+                           on_instance, size - on_instance))
+        assert fake.forms.alerts[0].startswith('Nothing is selected.'), fake.forms.alerts[0]
+        for fitting in info['fittings']:
+            size_text = fitting.get_Parameter(db.BuiltInParameter.RBS_CALCULATED_SIZE).AsString()
+            angle = math.degrees(fitting.LookupParameter('Angle').AsDouble())
+            expected = table.radius_for(bend_rules.normalize_size(size_text), angle)
+            assert abs(_radius(doc, fitting) - expected) < 1e-9, fitting.Id
+    return lambda: fake.run_script(BEND_50), check
+
+
+def _quantities_check(fake, doc, info, heading):
+    def check():
+        _expect_alerts(fake)
+        lines = fake.script.output.lines
+        assert heading in lines, lines[:3]
+        tables = dict((line[0], line[2]) for line in lines if isinstance(line, tuple))
+        conduits = {}
+        for row in tables['Conduits']:
+            conduits[row[0]] = conduits.get(row[0], 0) + row[2]
+        expected = {}
+        for conduit in info['conduits']:
+            name = _type_name(doc, conduit)
+            expected[name] = expected.get(name, 0) + 1
+        assert conduits == expected, conduits
+        assert sum(row[2] for row in tables['Conduit Fittings']) == len(info['fittings'])
+    return check
+
+
+def case_quantities(fake, size):
+    doc, info = models.build_conduit_model(size // 2)
+    fake.load(doc)
+    check = _quantities_check(fake, doc, info, 'Whole model scanned.')
+    return lambda: fake.run_script(QUANTITIES), check
+
+
+def case_quantities_refresh(fake, size):
+    doc, info = models.build_conduit_model(size // 2)
+    fake.load(doc)
+    fake.run_script(QUANTITIES)
+    # Types Apply on 1% of the conduits, so the next report only patches those.
+    _set_last_types(fake)
+    fake.select(info['conduits'][:max(1, size // 100)])
+    fake.run_script(TYPES_APPLY)
+    fake.clear_output()
+    check = _quantities_check(fake, doc, info, 'Updated from the elements changed since the last report.')
+    return lambda: fake.run_script(QUANTITIES), check
+
+
+def _parameter_editor(fake, size):
+    doc, info = models.build_parameter_model(size)
+    fake.load(doc, info['elements'])
+    window = fake.run_script(PARAMETER_EDITOR)['ui_window']
+    return window, info
+
+
+def case_parameter_editor_get(fake, size):
+    window, info = _parameter_editor(fake, size)
+    names = sorted(set(p.Definition.Name for p in info['elements'][0].Parameters))
+
+    def check():
+        assert not dotnet.MessageBox.shown, dotnet.MessageBox.shown
+        for row in window.parameter_rows:
+            assert list(row['combo'].ItemsSource) == names
+    return lambda: window.refresh_all_dropdowns_click(None, None), check
+
+
+def case_parameter_editor_set(fake, size):
+    window, info = _parameter_editor(fake, size)
+    for row, name in zip(window.parameter_rows, info['text_params']):
+        row['combo'].SelectedItem = name
+        row['text'].Text = 'benchmark'
+    names = info['text_params'][:len(window.parameter_rows)]
+
+    def check():
+        assert not dotnet.MessageBox.shown, dotnet.MessageBox.shown
+        for element in info['elements']:
+            for name in names:
+                assert element.LookupParameter(name).AsString() == 'benchmark', (element.Id, name)
+    return lambda: window.apply_parameters_click(None, None), check
+
+
+CASES = {
+    'isolate': case_isolate,
+    'isolate_clear': case_isolate_clear,
+    'rooms_to_model': case_rooms_to_model,
+    'types_apply': case_types_apply,
+    'bend_50': case_bend_50,
+    'bend_50_model': case_bend_50_model,
+    'quantities': case_quantities,
+    'quantities_refresh': case_quantities_refresh,
+    'parameter_editor_get': case_parameter_editor_get,
+    'parameter_editor_set': case_parameter_editor_set,
+}
+
+
+# --- Runner ---
+
+def prepare(fake, case, size):
+    """Cold-starts the fake, sets the case up and returns its (run, check)."""
+    fake.reset_session()
+    run, check = CASES[case](fake, size)
+    fake.clear_output()
+    return run, check
+
+
+def measure(fake, case, size, rounds):
+    timings = []
+    for _ in range(rounds):
+        run, check = prepare(fake, case, size)
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+        check()
+    return {'case': case, 'size': size, 'min': min(timings),
+            'median': statistics.median(timings), 'rounds': rounds}
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path, 'r') as f:
+        baseline = dict(((r['case'], r['size']), r) for r in json.load(f))
+    regressions = []
+    for result in results:
+        base = baseline.get((result['case'], result['size']))
+        if base and result['median'] > base['median'] * threshold:
+            regressions.append((result, result['median'] / base['median']))
+    for result, ratio in regressions:
+        print('REGRESSION {case} @ {size}: '.format(**result) + '{:.2f}x slower'.format(ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-c', '--cases', nargs='+', choices=sorted(CASES), default=sorted(CASES))
+    parser.add_argument('-s', '--sizes', nargs='+', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('-r', '--rounds', type=int, default=3)
+    parser.add_argument('--save', help='write the results to a JSON file')
+    parser.add_argument('--compare', help='baseline JSON written by --save')
+    parser.add_argument('--threshold', type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    fake = install()
+    results = []
+    print('{:<24} {:>8} {:>12} {:>12} {:>14}'.format('case', 'size', 'min ms', 'median ms', 'elements/s'))
+    for case in args.cases:
+        for size in args.sizes:
+            result = measure(fake, case, size, args.rounds)
+            results.append(result)
+            print('{:<24} {:>8} {:>12.1f} {:>12.1f} {:>14,.0f}'.format(
+                case, size, result['min'] * 1000, result['median'] * 1000, size / result['min']))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare and compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Offline stand-in for the Revit API slice used by the AATools buttons.
+
+    from fakerevit import install, models
+
+    fake = install()
+    fake.load(models.build_room_model(1000))
+    fake.run_script('MyScripts.extension/AATools.tab/.../script.py')
+
+install() registers fake Autodesk.Revit.*, System.*, wpf and pyrevit modules
+in sys.modules and puts the extension's lib/ folder on sys.path, so the real
+button scripts run unchanged under CPython.
+"""
+
+import os
+import sys
+import types
+
+from . import architecture, db, dotnet, pyrevit_stub, ui
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+EXTENSION_DIR = os.path.join(REPO_ROOT, 'MyScripts.extension')
+LIB_DIR = os.path.join(EXTENSION_DIR, 'lib')
+
+_instance = None
+
+
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+class FakeRevit(object):
+    """The installed fake: the pyRevit stand-ins plus the loaded model."""
+
+    def __init__(self):
+        self.db = db
+        self.revit = pyrevit_stub.RevitModule(db)
+        self.forms = pyrevit_stub.FormsModule()
+        self.script = pyrevit_stub.ScriptModule()
+        self.exec_params = pyrevit_stub.ExecParams()
+        self.last_exit = None
+        self._code_cache = {}
+        self._register_modules()
+
+    def _register_modules(self):
+        db.Architecture = architecture
+        sys.modules['Autodesk.Revit.DB'] = db
+        sys.modules['Autodesk.Revit.DB.Architecture'] = architecture
+        sys.modules['Autodesk.Revit.UI'] = ui
+        revit_pkg = _module('Autodesk.Revit', DB=db, UI=ui)
+        _module('Autodesk', Revit=revit_pkg)
+
+        generic = _module('System.Collections.Generic', List=dotnet.List)
+        collections = _module('System.Collections', Generic=generic)
+        windows_names = ('Window', 'WindowState', 'Thickness', 'VerticalAlignment',
+                         'MessageBox', 'MessageBoxButton', 'MessageBoxImage')
+        controls_names = ('StackPanel', 'ComboBox', 'TextBox', 'CheckBox',
+                          'Orientation', 'DockPanel', 'Dock')
+        controls = _module('System.Windows.Controls',
+                           **dict((n, getattr(dotnet, n)) for n in controls_names))
+        windows = _module('System.Windows', Controls=controls,
+                          **dict((n, getattr(dotnet, n)) for n in windows_names))
+        _module('System', Collections=collections, Windows=windows)
+        _module('wpf', LoadComponent=dotnet.LoadComponent)
+
+        sys.modules['pyrevit.revit'] = self.revit
+        sys.modules['pyrevit.forms'] = self.forms
+        sys.modules['pyrevit.script'] = self.script
+        _module('pyrevit', revit=self.revit, forms=self.forms, script=self.script,
+                DB=db, UI=ui, EXEC_PARAMS=self.exec_params)
+
+        if LIB_DIR not in sys.path:
+            sys.path.insert(0, LIB_DIR)
+
+    @property
+    def doc(self):
+        return self.revit.doc
+
+    @property
+    def uidoc(self):
+        return self.revit.uidoc
+
+    def load(self, doc, selection=()):
+        """Makes doc the active document, optionally with a selection."""
+        uidoc = ui.UIDocument(doc)
+        self.revit.uidoc = uidoc
+        ui.ExternalEvent.application = ui.UIApplication(uidoc)
+        self.select(selection)
+        return doc
+
+    def select(self, elements_or_ids):
+        ids = [getattr(e, 'Id', e) for e in elements_or_ids]
+        self.revit.uidoc.Selection.SetElementIds(ids)
+
+    def reset_session(self):
+        """Forgets session caches, stored data and dialog answers (a cold start)."""
+        for name in list(sys.modules):
+            if name == 'aatools' or name.startswith('aatools.'):
+                del sys.modules[name]
+        self.script.data.clear()
+        self.forms.responses.clear()
+        self.clear_output()
+
+    def clear_output(self):
+        """Forgets the alerts, printed output and message boxes shown so far."""
+        del self.forms.alerts[:]
+        del self.script.output.lines[:]
+        del dotnet.MessageBox.shown[:]
+
+    def compile_script(self, path):
+        path = os.path.join(REPO_ROOT, path)
+        if path not in self._code_cache:
+            with open(path, 'r') as f:
+                self._code_cache[path] = compile(f.read(), path, 'exec')
+        return path, self._code_cache[path]
+
+    def run_script(self, path, run_name='__main__'):
+        """
+        Runs a button script like pyRevit does and returns its globals.
+        A script that stops through forms.alert(exitscript=True) or
+        script.exit() leaves the ScriptExit in last_exit.
+        """
+        path, code = self.compile_script(path)
+        namespace = {'__name__': run_name, '__file__': path}
+        self.last_exit = None
+        try:
+            exec(code, namespace)
+        except pyrevit_stub.ScriptExit as e:
+            self.last_exit = e
+        return namespace
+
+
+def install():
+    """Installs the fake modules once and returns the FakeRevit instance."""
+    global _instance
+    if _instance is None:
+        _instance = FakeRevit()
+    return _instance
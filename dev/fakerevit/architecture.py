@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""
+Stand-in for Autodesk.Revit.DB.Architecture.
+"""
+
+from .db import BuiltInCategory, Element, LocationPoint
+
+
+class SpatialElement(Element):
+    pass
+
+
+class Room(SpatialElement):
+    def __init__(self, level, point, area=0.0):
+        Element.__init__(self, BuiltInCategory.OST_Rooms)
+        self.Level = level
+        self.LevelId = level.Id if level is not None else None
+        self.Location = LocationPoint(point)
+        self.Area = area
+        self.boundary = []
+
+    def GetBoundarySegments(self, options):
+        return self.boundary
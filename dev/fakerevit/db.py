@@ -0,0 +1,1176 @@
+# -*- coding: utf-8 -*-
+"""
+Stand-in for the slice of Autodesk.Revit.DB used by the AATools scripts.
+
+Behaviour follows the Revit API closely enough for the scripts' logic to
+run unchanged: element lookups, collectors, parameters (including the
+"modification outside transaction" rule), transactions, basic geometry and
+view overrides. Transactions and sub-transactions undo their changes on
+rollback; a commit raises DocumentChanged with the ids added, modified and
+deleted since the transaction started.
+"""
+
+import itertools
+import math
+import uuid
+from enum import IntEnum
+
+
+# --- Exceptions ---
+
+class InvalidOperationException(Exception):
+    pass
+
+
+class ModificationOutsideTransactionException(InvalidOperationException):
+    pass
+
+
+# --- Enumerations ---
+
+class BuiltInCategory(IntEnum):
+    INVALID = -1
+    OST_Walls = -2000011
+    OST_RoomSeparationLines = -2000066
+    OST_GenericModel = -2000151
+    OST_Rooms = -2000160
+    OST_Levels = -2000240
+    OST_Views = -2000279
+    OST_SketchPlanes = -2000300
+    OST_ConduitFitting = -2008128
+    OST_Conduit = -2008132
+
+
+class BuiltInParameter(IntEnum):
+    INVALID = -1
+    ALL_MODEL_TYPE_NAME = -1002002
+    ALL_MODEL_FAMILY_NAME = -1002003
+    ALL_MODEL_INSTANCE_COMMENTS = -1010106
+    CURVE_ELEM_LENGTH = -1004005
+    ROOM_NAME = -1006920
+    ROOM_NUMBER = -1006921
+    ROOM_AREA = -1006902
+    RBS_CALCULATED_SIZE = -1140244
+    RBS_CONDUIT_DIAMETER_PARAM = -1140226
+    RBS_CONDUIT_BENDRADIUS = -1140240
+    ELEM_TYPE_PARAM = -1002052
+    VIEW_PHASE = -1012101
+
+
+class _EnumValue(object):
+    """A .NET-like enum member: compares by identity and has ToString()."""
+
+    def __init__(self, owner, name, value):
+        self._owner = owner
+        self._name = name
+        self.value__ = value
+
+    def ToString(self):
+        return self._name
+
+    def __int__(self):
+        return self.value__
+
+    def __repr__(self):
+        return '{}.{}'.format(self._owner, self._name)
+
+
+def _dotnet_enum(name, members):
+    namespace = {}
+    for value, member in enumerate(members):
+        namespace[member] = _EnumValue(name, member, value)
+    return type(name, (object,), namespace)
+
+
+StorageType = _dotnet_enum('StorageType', ['None_', 'Integer', 'Double', 'String', 'ElementId'])
+setattr(StorageType, 'None', StorageType.None_)
+ViewType = _dotnet_enum('ViewType', ['FloorPlan', 'CeilingPlan', 'ThreeD', 'Section', 'DrawingSheet'])
+TransactionStatus = _dotnet_enum('TransactionStatus', ['Uninitialized', 'Started', 'RolledBack', 'Committed', 'Pending', 'Error'])
+
+
+# --- Ids ---
+
+class ElementId(object):
+    __slots__ = ('IntegerValue',)
+
+    def __init__(self, value):
+        self.IntegerValue = int(value)
+
+    @property
+    def Value(self):
+        return self.IntegerValue
+
+    def __eq__(self, other):
+        return isinstance(other, ElementId) and other.IntegerValue == self.IntegerValue
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.IntegerValue)
+
+    def __repr__(self):
+        return 'ElementId({})'.format(self.IntegerValue)
+
+    def ToString(self):
+        return str(self.IntegerValue)
+
+
+ElementId.InvalidElementId = ElementId(-1)
+
+
+# --- Categories ---
+
+class Category(object):
+    def __init__(self, builtin_category, name):
+        self.Id = ElementId(builtin_category)
+        self.Name = name
+        self.BuiltInCategory = builtin_category
+
+
+_CATEGORY_NAMES = {
+    BuiltInCategory.OST_Walls: 'Walls',
+    BuiltInCategory.OST_RoomSeparationLines: '<Room Separation>',
+    BuiltInCategory.OST_GenericModel: 'Generic Models',
+    BuiltInCategory.OST_Rooms: 'Rooms',
+    BuiltInCategory.OST_Levels: 'Levels',
+    BuiltInCategory.OST_Views: 'Views',
+    BuiltInCategory.OST_SketchPlanes: 'Sketch Planes',
+    BuiltInCategory.OST_ConduitFitting: 'Conduit Fittings',
+    BuiltInCategory.OST_Conduit: 'Conduits',
+}
+
+CATEGORIES = dict((bic, Category(bic, name)) for bic, name in _CATEGORY_NAMES.items())
+
+
+class Categories(object):
+    def get_Item(self, key):
+        if isinstance(key, BuiltInCategory):
+            return CATEGORIES[key]
+        for category in CATEGORIES.values():
+            if category.Name == key:
+                return category
+        raise KeyError(key)
+
+
+class Settings(object):
+    def __init__(self):
+        self.Categories = Categories()
+
+
+# --- Parameters ---
+
+class Definition(object):
+    def __init__(self, name, builtin=None):
+        self.Name = name
+        self.BuiltInParameter = builtin
+
+
+_definitions = {}
+_definition_ids = itertools.count(900000)
+_definition_id_map = {}
+
+
+def definition(name, builtin=None):
+    """Returns the shared Definition object for a parameter name."""
+    key = (name, builtin)
+    if key not in _definitions:
+        _definitions[key] = Definition(name, builtin)
+        _definition_id_map[key] = ElementId(builtin) if builtin is not None else ElementId(next(_definition_ids))
+    return _definitions[key]
+
+
+def _storage_for(value):
+    if isinstance(value, ElementId):
+        return StorageType.ElementId
+    if isinstance(value, bool) or isinstance(value, int):
+        return StorageType.Integer
+    if isinstance(value, float):
+        return StorageType.Double
+    return StorageType.String
+
+
+class Parameter(object):
+    __slots__ = ('Element', 'Definition', 'StorageType', 'IsReadOnly', '_value', 'Id')
+
+    def __init__(self, element, definition_, storage_type, value=None, read_only=False):
+        self.Element = element
+        self.Definition = definition_
+        self.StorageType = storage_type
+        self.IsReadOnly = read_only
+        self._value = value
+        self.Id = _definition_id_map[(definition_.Name, definition_.BuiltInParameter)]
+
+    @property
+    def HasValue(self):
+        return self._value is not None
+
+    def AsString(self):
+        if self.StorageType is StorageType.String:
+            return self._value
+        return None
+
+    def AsValueString(self):
+        return None if self._value is None else str(self._value)
+
+    def AsDouble(self):
+        return float(self._value) if self.StorageType is StorageType.Double and self._value is not None else 0.0
+
+    def AsInteger(self):
+        return int(self._value) if self.StorageType is StorageType.Integer and self._value is not None else 0
+
+    def AsElementId(self):
+        if self.StorageType is StorageType.ElementId and self._value is not None:
+            return self._value
+        return ElementId.InvalidElementId
+
+    def Set(self, value):
+        doc = self.Element.Document
+        if doc is not None and not doc.IsModifiable:
+            raise ModificationOutsideTransactionException(
+                "Attempt to modify the model outside of transaction.")
+        if self.IsReadOnly:
+            raise InvalidOperationException("The parameter is read-only.")
+        storage = self.StorageType
+        if storage is StorageType.String:
+            if not isinstance(value, str):
+                return False
+        elif storage is StorageType.Double:
+            if isinstance(value, str) or isinstance(value, ElementId):
+                return False
+            value = float(value)
+        elif storage is StorageType.Integer:
+            if not isinstance(value, int):
+                return False
+        elif storage is StorageType.ElementId:
+            if not isinstance(value, ElementId):
+                return False
+        doc._remember(setattr, self, '_value', self._value)
+        self._value = value
+        doc._record_modified(self.Element)
+        return True
+
+
+# --- Elements ---
+
+class Element(object):
+    """Base element. Parameters are added with add_parameter()."""
+
+    def __init__(self, category=None, name=None):
+        self.Id = ElementId.InvalidElementId
+        self.UniqueId = None
+        self.Document = None
+        self.Category = CATEGORIES[category] if category is not None else None
+        self.Location = None
+        self.OwnerViewId = ElementId.InvalidElementId
+        self._name = name
+        self._params = []
+        self._by_name = {}
+        self._by_builtin = {}
+        self._type_id = ElementId.InvalidElementId
+
+    @property
+    def Name(self):
+        return self._name
+
+    @property
+    def Parameters(self):
+        return list(self._params)
+
+    def add_parameter(self, name, value, storage_type=None, builtin=None, read_only=False):
+        definition_ = definition(name, builtin)
+        storage = storage_type or _storage_for(value)
+        param = Parameter(self, definition_, storage, value, read_only)
+        self._params.append(param)
+        self._by_name.setdefault(name, param)
+        if builtin is not None:
+            self._by_builtin[builtin] = param
+        return param
+
+    def get_Parameter(self, key):
+        if isinstance(key, BuiltInParameter):
+            return self._by_builtin.get(key)
+        if isinstance(key, Definition):
+            if key.BuiltInParameter is not None:
+                return self._by_builtin.get(key.BuiltInParameter)
+            return self._by_name.get(key.Name)
+        return self._by_name.get(key)
+
+    def LookupParameter(self, name):
+        return self._by_name.get(name)
+
+    def GetTypeId(self):
+        return self._type_id
+
+    def ChangeTypeId(self, type_id):
+        doc = self.Document
+        if doc is not None and not doc.IsModifiable:
+            raise ModificationOutsideTransactionException(
+                "Attempt to modify the model outside of transaction.")
+        doc._remember(setattr, self, '_type_id', self._type_id)
+        self._type_id = type_id
+        doc._record_modified(self)
+        return self.Id
+
+
+class ElementType(Element):
+    @property
+    def FamilyName(self):
+        param = self.get_Parameter(BuiltInParameter.ALL_MODEL_FAMILY_NAME)
+        return param.AsString() if param else None
+
+
+class FamilySymbol(ElementType):
+    pass
+
+
+class FamilyInstance(Element):
+    @property
+    def Symbol(self):
+        return self.Document.GetElement(self._type_id)
+
+
+class MEPCurve(Element):
+    pass
+
+
+class Level(Element):
+    def __init__(self, name, elevation=0.0):
+        Element.__init__(self, BuiltInCategory.OST_Levels, name)
+        self.Elevation = elevation
+
+
+class SketchPlane(Element):
+    def __init__(self, level_id=None):
+        Element.__init__(self, BuiltInCategory.OST_SketchPlanes)
+        self.LevelId = level_id
+
+    @staticmethod
+    def Create(doc, level_id):
+        return doc.add(SketchPlane(level_id))
+
+
+class CurveElement(Element):
+    @property
+    def GeometryCurve(self):
+        return self.Location.Curve
+
+
+class ModelCurve(CurveElement):
+    pass
+
+
+class OverrideGraphicSettings(object):
+    def __init__(self, other=None):
+        self.Halftone = other.Halftone if other else False
+        self.Transparency = other.Transparency if other else 0
+
+    def SetHalftone(self, value):
+        self.Halftone = bool(value)
+        return self
+
+    def SetSurfaceTransparency(self, value):
+        self.Transparency = int(value)
+        return self
+
+
+class View(Element):
+    def __init__(self, name, view_type=None, level=None):
+        Element.__init__(self, BuiltInCategory.OST_Views, name)
+        self.ViewType = view_type or ViewType.FloorPlan
+        self.GenLevel = level
+        self._overrides = {}
+
+    def SetElementOverrides(self, element_id, settings):
+        doc = self.Document
+        if doc is not None and not doc.IsModifiable:
+            raise ModificationOutsideTransactionException(
+                "Attempt to modify the model outside of transaction.")
+        if doc is not None:
+            doc._remember(self._restore_overrides, element_id, self._overrides.get(element_id))
+        if settings.Halftone or settings.Transparency:
+            self._overrides[element_id] = OverrideGraphicSettings(settings)
+        else:
+            self._overrides.pop(element_id, None)
+
+    def _restore_overrides(self, element_id, settings):
+        if settings is None:
+            self._overrides.pop(element_id, None)
+        else:
+            self._overrides[element_id] = settings
+
+    def GetElementOverrides(self, element_id):
+        return OverrideGraphicSettings(self._overrides.get(element_id))
+
+
+# --- Geometry ---
+
+class XYZ(object):
+    __slots__ = ('X', 'Y', 'Z')
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.X = float(x)
+        self.Y = float(y)
+        self.Z = float(z)
+
+    def __add__(self, other):
+        return XYZ(self.X + other.X, self.Y + other.Y, self.Z + other.Z)
+
+    def __sub__(self, other):
+        return XYZ(self.X - other.X, self.Y - other.Y, self.Z - other.Z)
+
+    def Add(self, other):
+        return self + other
+
+    def Subtract(self, other):
+        return self - other
+
+    def Multiply(self, value):
+        return XYZ(self.X * value, self.Y * value, self.Z * value)
+
+    def GetLength(self):
+        return math.sqrt(self.X * self.X + self.Y * self.Y + self.Z * self.Z)
+
+    def Normalize(self):
+        length = self.GetLength()
+        return XYZ(self.X / length, self.Y / length, self.Z / length) if length else XYZ()
+
+    def DistanceTo(self, other):
+        return (self - other).GetLength()
+
+    def IsAlmostEqualTo(self, other, tolerance=1e-9):
+        return (abs(self.X - other.X) <= tolerance and abs(self.Y - other.Y) <= tolerance
+                and abs(self.Z - other.Z) <= tolerance)
+
+    def __repr__(self):
+        return 'XYZ({}, {}, {})'.format(self.X, self.Y, self.Z)
+
+
+XYZ.Zero = XYZ(0, 0, 0)
+XYZ.BasisZ = XYZ(0, 0, 1)
+
+
+class UV(object):
+    __slots__ = ('U', 'V')
+
+    def __init__(self, u=0.0, v=0.0):
+        self.U = float(u)
+        self.V = float(v)
+
+
+class Transform(object):
+    def __init__(self, origin=None):
+        self.Origin = origin or XYZ()
+
+    @staticmethod
+    def CreateTranslation(vector):
+        return Transform(vector)
+
+    def OfPoint(self, point):
+        return point + self.Origin
+
+    def OfVector(self, vector):
+        return vector
+
+
+Transform.Identity = Transform()
+
+
+class Curve(object):
+    def __init__(self, points):
+        self._points = points
+
+    @property
+    def IsBound(self):
+        return True
+
+    def GetEndPoint(self, index):
+        return self._points[0] if index == 0 else self._points[-1]
+
+    def Tessellate(self):
+        return list(self._points)
+
+    def CreateTransformed(self, transform):
+        return self.__class__._from_points([transform.OfPoint(p) for p in self._points])
+
+    @classmethod
+    def _from_points(cls, points):
+        curve = cls.__new__(cls)
+        Curve.__init__(curve, points)
+        return curve
+
+
+class Line(Curve):
+    @staticmethod
+    def CreateBound(start, end):
+        if start.IsAlmostEqualTo(end, 1e-6):
+            raise InvalidOperationException("Curve length is too small for Revit's tolerance.")
+        return Line._from_points([start, end])
+
+    @property
+    def Direction(self):
+        return (self._points[1] - self._points[0]).Normalize()
+
+    @property
+    def Length(self):
+        return self._points[0].DistanceTo(self._points[1])
+
+
+class Arc(Curve):
+    @staticmethod
+    def Create(end0, end1, point_on_arc):
+        return Arc._from_points([end0, point_on_arc, end1])
+
+    def Evaluate(self, parameter, normalized):
+        return self._points[1]
+
+    @property
+    def Length(self):
+        return self._points[0].DistanceTo(self._points[1]) + self._points[1].DistanceTo(self._points[2])
+
+
+class CurveArray(object):
+    def __init__(self):
+        self._curves = []
+
+    def Append(self, curve):
+        self._curves.append(curve)
+
+    @property
+    def IsEmpty(self):
+        return not self._curves
+
+    @property
+    def Size(self):
+        return len(self._curves)
+
+    def __iter__(self):
+        return iter(self._curves)
+
+
+class Location(object):
+    pass
+
+
+class LocationPoint(Location):
+    def __init__(self, point):
+        self.Point = point
+
+
+class LocationCurve(Location):
+    def __init__(self, curve):
+        self.Curve = curve
+
+
+class BoundarySegment(object):
+    def __init__(self, curve, element_id=None):
+        self._curve = curve
+        self.ElementId = element_id or ElementId.InvalidElementId
+
+    def GetCurve(self):
+        return self._curve
+
+
+class SpatialElementBoundaryOptions(object):
+    pass
+
+
+# --- Filters ---
+
+class ElementFilter(object):
+    def PassesFilter(self, element):
+        raise NotImplementedError
+
+
+class _BeginsWithRule(object):
+    def __init__(self, param_id, text, case_sensitive=True):
+        self.param_id = param_id
+        self.text = text if case_sensitive else text.lower()
+        self.case_sensitive = case_sensitive
+
+    def passes(self, element):
+        for param in element._params:
+            if param.Id == self.param_id:
+                value = param.AsString() or ''
+                if not self.case_sensitive:
+                    value = value.lower()
+                return value.startswith(self.text)
+        return False
+
+
+class ParameterFilterRuleFactory(object):
+    @staticmethod
+    def CreateBeginsWithRule(param_id, text, case_sensitive=None):
+        return _BeginsWithRule(param_id, text, case_sensitive is not False)
+
+
+class ElementParameterFilter(ElementFilter):
+    def __init__(self, rule, inverted=False):
+        self.rule = rule
+        self.inverted = inverted
+
+    def PassesFilter(self, element):
+        return self.rule.passes(element) != self.inverted
+
+
+class LogicalOrFilter(ElementFilter):
+    def __init__(self, *filters):
+        if len(filters) == 1 and not isinstance(filters[0], ElementFilter):
+            filters = tuple(filters[0])
+        self.filters = filters
+
+    def PassesFilter(self, element):
+        return any(f.PassesFilter(element) for f in self.filters)
+
+
+class ElementCategoryFilter(ElementFilter):
+    def __init__(self, category):
+        self.category_id = int(category)
+
+    def PassesFilter(self, element):
+        return element.Category is not None and element.Category.Id.IntegerValue == self.category_id
+
+
+class ElementMulticategoryFilter(ElementFilter):
+    def __init__(self, categories, inverted=False):
+        self.category_ids = set(int(category) for category in categories)
+        self.inverted = inverted
+
+    def PassesFilter(self, element):
+        passes = element.Category is not None and element.Category.Id.IntegerValue in self.category_ids
+        return passes != self.inverted
+
+
+class FilteredElementCollector(object):
+    """Lazy collector; each quick filter narrows the element stream."""
+
+    def __init__(self, doc, view_id=None):
+        self._doc = doc
+        self._view_id = view_id
+        self._filters = []
+        doc.collector_count += 1
+
+    def _add(self, predicate):
+        self._filters.append(predicate)
+        return self
+
+    def OfCategory(self, category):
+        category_id = int(category)
+        return self._add(lambda e: e.Category is not None and e.Category.Id.IntegerValue == category_id)
+
+    def OfClass(self, cls):
+        return self._add(lambda e: isinstance(e, cls))
+
+    def WhereElementIsElementType(self):
+        return self._add(lambda e: isinstance(e, ElementType))
+
+    def WhereElementIsNotElementType(self):
+        return self._add(lambda e: not isinstance(e, ElementType))
+
+    def WherePasses(self, element_filter):
+        return self._add(element_filter.PassesFilter)
+
+    def _iter(self):
+        if self._view_id is not None:
+            source = self._doc._visible_in(self._view_id)
+        else:
+            source = self._doc._elements.values()
+        filters = self._filters
+        for element in source:
+            if all(f(element) for f in filters):
+                yield element
+
+    def __iter__(self):
+        return self._iter()
+
+    def ToElements(self):
+        return list(self._iter())
+
+    def ToElementIds(self):
+        return [e.Id for e in self._iter()]
+
+    def FirstElement(self):
+        return next(self._iter(), None)
+
+    def GetElementCount(self):
+        return sum(1 for _ in self._iter())
+
+
+# --- Transactions ---
+
+class _TransactionBase(object):
+    def __init__(self, doc, name=None):
+        self._doc = doc
+        self._name = name
+        self._status = TransactionStatus.Uninitialized
+        self._started = False
+
+    def GetName(self):
+        return self._name
+
+    def SetName(self, name):
+        self._name = name
+
+    def HasStarted(self):
+        # Like Revit: stays true once started, also after Commit or RollBack.
+        return self._started
+
+    def HasEnded(self):
+        return self._status in (TransactionStatus.Committed, TransactionStatus.RolledBack)
+
+    def GetStatus(self):
+        return self._status
+
+    def IsValidObject(self):
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        # Like Dispose(): an unfinished transaction is rolled back.
+        if self._status is TransactionStatus.Started:
+            self.RollBack()
+        return False
+
+    def _begin(self):
+        self._started = True
+        self._status = TransactionStatus.Started
+        return self._status
+
+    def _require_started(self):
+        if self._status is not TransactionStatus.Started:
+            raise InvalidOperationException(
+                "The {} has not been started yet.".format(type(self).__name__))
+
+    def Dispose(self):
+        self.__exit__(None, None, None)
+
+
+class Transaction(_TransactionBase):
+    def __init__(self, doc, name=None):
+        _TransactionBase.__init__(self, doc, name)
+        self._options = None
+
+    def GetFailureHandlingOptions(self):
+        return self._options or FailureHandlingOptions()
+
+    def SetFailureHandlingOptions(self, options):
+        self._options = options
+
+    def Start(self, name=None):
+        if name:
+            self._name = name
+        if self._doc._open_transaction is not None:
+            raise InvalidOperationException("Starting a new transaction is not permitted.")
+        self._doc._open_transaction = self
+        self._doc._journal.append([])
+        return self._begin()
+
+    def Commit(self, options=None):
+        self._require_started()
+        options = options or self._options
+        if options is not None and options.preprocessor is not None:
+            self._doc._run_failures(options.preprocessor)
+        self._doc._open_transaction = None
+        self._doc._pending_failures = []
+        self._doc._end_journal(undo=False)
+        self._doc.commit_count += 1
+        self._status = TransactionStatus.Committed
+        self._doc._raise_changed()
+        return self._status
+
+    def RollBack(self, options=None):
+        self._require_started()
+        self._doc._open_transaction = None
+        self._doc._pending_failures = []
+        self._doc._end_journal(undo=True)
+        self._doc._clear_changes()
+        self._doc.rollback_count += 1
+        self._status = TransactionStatus.RolledBack
+        return self._status
+
+
+class SubTransaction(_TransactionBase):
+    def __init__(self, doc):
+        _TransactionBase.__init__(self, doc)
+
+    def Start(self):
+        if self._doc._open_transaction is None:
+            raise InvalidOperationException("A sub-transaction needs an open transaction.")
+        self._doc._journal.append([])
+        return self._begin()
+
+    def Commit(self):
+        self._require_started()
+        self._doc._end_journal(undo=False)
+        self._status = TransactionStatus.Committed
+        return self._status
+
+    def RollBack(self):
+        self._require_started()
+        self._doc._end_journal(undo=True)
+        self._status = TransactionStatus.RolledBack
+        return self._status
+
+
+class TransactionGroup(_TransactionBase):
+    def Start(self, name=None):
+        if name:
+            self._name = name
+        return self._begin()
+
+    def Assimilate(self):
+        self._require_started()
+        self._status = TransactionStatus.Committed
+        return self._status
+
+    def Commit(self):
+        return self.Assimilate()
+
+    def RollBack(self):
+        self._require_started()
+        self._status = TransactionStatus.RolledBack
+        return self._status
+
+
+# --- Failures ---
+
+class FailureSeverity(object):
+    NoSeverity = _EnumValue('FailureSeverity', 'NoSeverity', 0)
+    Warning = _EnumValue('FailureSeverity', 'Warning', 1)
+    Error = _EnumValue('FailureSeverity', 'Error', 2)
+
+
+class FailureProcessingResult(object):
+    Continue = _EnumValue('FailureProcessingResult', 'Continue', 0)
+    ProceedWithCommit = _EnumValue('FailureProcessingResult', 'ProceedWithCommit', 1)
+    ProceedWithRollBack = _EnumValue('FailureProcessingResult', 'ProceedWithRollBack', 2)
+
+
+class FailureDefinitionId(object):
+    def __init__(self, name):
+        self.Guid = name
+
+    def __eq__(self, other):
+        return isinstance(other, FailureDefinitionId) and other.Guid == self.Guid
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.Guid)
+
+
+class _FailureGroup(object):
+    def __init__(self, group, names):
+        for name in names:
+            setattr(self, name, FailureDefinitionId(group + '.' + name))
+
+
+class BuiltInFailures(object):
+    RoomFailures = _FailureGroup('RoomFailures', ['RoomNotEnclosed', 'RoomsInSameRegion'])
+    OverlapFailures = _FailureGroup('OverlapFailures', [
+        'RoomSeparationLinesOverlap', 'LinesOverlap', 'DuplicateInstances'])
+
+
+class FailureMessage(object):
+    def __init__(self, definition_id, severity=None):
+        self._id = definition_id
+        self._severity = severity or FailureSeverity.Warning
+
+    def GetFailureDefinitionId(self):
+        return self._id
+
+    def GetSeverity(self):
+        return self._severity
+
+
+class FailureMessageAccessor(FailureMessage):
+    pass
+
+
+class FailuresAccessor(object):
+    def __init__(self, doc, messages):
+        self._doc = doc
+        self._messages = list(messages)
+        self.deleted = []
+
+    def GetDocument(self):
+        return self._doc
+
+    def GetFailureMessages(self):
+        return list(self._messages)
+
+    def DeleteWarning(self, message):
+        if message.GetSeverity() is not FailureSeverity.Warning:
+            raise InvalidOperationException("Only warnings can be deleted.")
+        self._messages.remove(message)
+        self.deleted.append(message)
+
+    def DeleteAllWarnings(self):
+        for message in list(self._messages):
+            if message.GetSeverity() is FailureSeverity.Warning:
+                self.DeleteWarning(message)
+
+
+class IFailuresPreprocessor(object):
+    def PreprocessFailures(self, failures_accessor):
+        return FailureProcessingResult.Continue
+
+
+class FailureHandlingOptions(object):
+    def __init__(self):
+        self.preprocessor = None
+        self.clear_after_rollback = False
+
+    def SetFailuresPreprocessor(self, preprocessor):
+        self.preprocessor = preprocessor
+        return self
+
+    def SetClearAfterRollback(self, value):
+        self.clear_after_rollback = value
+        return self
+
+
+# --- Document ---
+
+class _Event(object):
+    """Supports the IronPython `event += handler` syntax."""
+
+    def __init__(self):
+        self.handlers = []
+
+    def __iadd__(self, handler):
+        self.handlers.append(handler)
+        return self
+
+    def __isub__(self, handler):
+        self.handlers.remove(handler)
+        return self
+
+    def fire(self, sender, args):
+        for handler in list(self.handlers):
+            handler(sender, args)
+
+
+class Application(object):
+    def __init__(self):
+        self.DocumentChanged = _Event()
+        self.DocumentClosing = _Event()
+        self.DocumentSaved = _Event()
+        self.VersionNumber = '2024'
+
+
+class DocumentChangedEventArgs(object):
+    def __init__(self, doc, added, modified, deleted):
+        self._doc = doc
+        self._added = added
+        self._modified = modified
+        self._deleted = deleted
+
+    def GetDocument(self):
+        return self._doc
+
+    def _filtered(self, ids, element_filter):
+        if element_filter is None:
+            return list(ids)
+        elements = (self._doc.GetElement(element_id) for element_id in ids)
+        return [e.Id for e in elements if e is not None and element_filter.PassesFilter(e)]
+
+    def GetAddedElementIds(self, element_filter=None):
+        return self._filtered(self._added, element_filter)
+
+    def GetModifiedElementIds(self, element_filter=None):
+        return self._filtered(self._modified, element_filter)
+
+    def GetDeletedElementIds(self):
+        return list(self._deleted)
+
+
+class DocumentEventArgs(object):
+    def __init__(self, doc):
+        self.Document = doc
+
+
+class DocumentVersion(object):
+    def __init__(self, version_guid, number_of_saves):
+        self.VersionGUID = version_guid
+        self.NumberOfSaves = number_of_saves
+
+
+class ModelCurveArray(list):
+    @property
+    def Size(self):
+        return len(self)
+
+
+class DocumentCreation(object):
+    def __init__(self, doc):
+        self._doc = doc
+
+    def NewRoom(self, level, point):
+        from .architecture import Room
+        self._doc._require_transaction()
+        room = Room(level, XYZ(point.U, point.V, level.Elevation if level else 0.0))
+        self._doc._room_template(room)
+        return self._doc.add(room)
+
+    def NewRoomBoundaryLines(self, sketch_plane, curves, view):
+        self._doc._require_transaction()
+        created = ModelCurveArray()
+        for curve in curves:
+            separator = ModelCurve(BuiltInCategory.OST_RoomSeparationLines)
+            separator.Location = LocationCurve(curve)
+            separator.OwnerViewId = view.Id
+            created.append(self._doc.add(separator))
+        return created
+
+
+class Document(object):
+    def __init__(self, title='Fake Model.rvt', path_name=None):
+        self.Title = title
+        self.PathName = path_name or ''
+        self.Application = Application()
+        self.Settings = Settings()
+        self.Create = DocumentCreation(self)
+        self.ActiveView = None
+        self._elements = {}
+        self._by_unique_id = {}
+        self._ids = itertools.count(100000)
+        self._open_transaction = None
+        self._pending_failures = []
+        self._journal = []     # undo steps, one list per open (sub-)transaction
+        self._added = set()
+        self._modified = set()
+        self._deleted = set()
+        self._version = DocumentVersion(uuid.uuid4(), 0)
+        self.room_parameter_names = []
+        self.collector_count = 0
+        self.commit_count = 0
+        self.rollback_count = 0
+        self.regenerate_count = 0
+
+    # Helpers used by the model generators.
+
+    def add(self, element):
+        element.Id = ElementId(next(self._ids))
+        element.UniqueId = str(uuid.UUID(int=element.Id.IntegerValue))
+        element.Document = self
+        self._elements[element.Id] = element
+        self._by_unique_id[element.UniqueId] = element
+        if self._open_transaction is not None:
+            self._added.add(element.Id)
+            self._remember(self._unadd, element)
+        return element
+
+    def raise_failure(self, definition_id, severity=None):
+        """Queues a failure that the open transaction reports on commit."""
+        self._pending_failures.append(FailureMessageAccessor(definition_id, severity))
+
+    def _room_template(self, room):
+        for name, builtin, storage in self.room_parameter_names:
+            room.add_parameter(name, None, storage, builtin)
+
+    def _require_transaction(self):
+        if not self.IsModifiable:
+            raise ModificationOutsideTransactionException(
+                "Attempt to modify the model outside of transaction.")
+
+    def _record_modified(self, element):
+        self._modified.add(element.Id)
+
+    def _remember(self, undo, *args):
+        if self._journal:
+            self._journal[-1].append((undo, args))
+
+    def _end_journal(self, undo):
+        # Rolled back: undo the steps newest first. Committed: the steps
+        # belong to the enclosing transaction, if any.
+        steps = self._journal.pop()
+        if undo:
+            for step, args in reversed(steps):
+                step(*args)
+        elif self._journal:
+            self._journal[-1].extend(steps)
+
+    def _unadd(self, element):
+        del self._elements[element.Id]
+        self._by_unique_id.pop(element.UniqueId, None)
+        self._added.discard(element.Id)
+        self._modified.discard(element.Id)
+
+    def _undelete(self, element):
+        self._elements[element.Id] = element
+        self._by_unique_id[element.UniqueId] = element
+        self._deleted.discard(element.Id)
+
+    def _clear_changes(self):
+        self._added = set()
+        self._modified = set()
+        self._deleted = set()
+
+    def _raise_changed(self):
+        added, deleted = self._added, self._deleted
+        modified = self._modified - added - deleted
+        self._clear_changes()
+        if added or modified or deleted:
+            self.Application.DocumentChanged.fire(
+                self.Application, DocumentChangedEventArgs(self, added, modified, deleted))
+
+    def _visible_in(self, view_id):
+        for element in self._elements.values():
+            owner = element.OwnerViewId
+            if owner.IntegerValue == -1 or owner == view_id:
+                if not isinstance(element, (ElementType, View)):
+                    yield element
+
+    def _run_failures(self, preprocessor):
+        if not self._pending_failures:
+            return
+        accessor = FailuresAccessor(self, self._pending_failures)
+        preprocessor.PreprocessFailures(accessor)
+        self.deleted_warnings = getattr(self, 'deleted_warnings', 0) + len(accessor.deleted)
+
+    # Revit API surface.
+
+    @staticmethod
+    def GetDocumentVersion(doc):
+        return doc._version
+
+    def Save(self):
+        self._version = DocumentVersion(uuid.uuid4(), self._version.NumberOfSaves + 1)
+        self.Application.DocumentSaved.fire(self.Application, DocumentEventArgs(self))
+
+    def Close(self, save_modified=False):
+        self.Application.DocumentClosing.fire(self.Application, DocumentEventArgs(self))
+        return True
+
+    @property
+    def IsModifiable(self):
+        return self._open_transaction is not None
+
+    def GetElement(self, key):
+        if isinstance(key, str):
+            return self._by_unique_id.get(key)
+        if isinstance(key, int):
+            key = ElementId(key)
+        return self._elements.get(key)
+
+    def Regenerate(self):
+        self._require_transaction()
+        self.regenerate_count += 1
+
+    def Delete(self, ids):
+        self._require_transaction()
+        if isinstance(ids, ElementId):
+            ids = [ids]
+        deleted = []
+        for element_id in ids:
+            element = self._elements.pop(element_id, None)
+            if element is not None:
+                self._by_unique_id.pop(element.UniqueId, None)
+                self._deleted.add(element_id)
+                self._remember(self._undelete, element)
+                deleted.append(element_id)
+        return deleted
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Stand-ins for the .NET modules the scripts import: System,
+System.Collections.Generic, System.Windows(.Controls) and pyRevit's wpf.
+WPF controls are plain attribute bags, enough for code-behind logic to run.
+"""
+
+import re
+
+
+# --- System.Collections.Generic ---
+
+class _GenericList(object):
+    """List[T](items) -> a Python list."""
+
+    def __getitem__(self, item_type):
+        return _TypedList
+
+
+class _TypedList(list):
+    @property
+    def Count(self):
+        return len(self)
+
+
+List = _GenericList()
+
+
+# --- System.Windows ---
+
+class _Children(list):
+    def Add(self, child):
+        self.append(child)
+
+    def Clear(self):
+        del self[:]
+
+
+class Control(object):
+    """
+    Generic WPF control: keyword arguments become attributes. Defaults are
+    set in __new__ because, as with .NET base classes under IronPython,
+    subclasses do not call the base __init__.
+    """
+
+    def __new__(cls, *args, **kwargs):
+        control = object.__new__(cls)
+        control._set_defaults()
+        return control
+
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+    def _set_defaults(self):
+        self.Children = _Children()
+        self.Text = ''
+        self.SelectedItem = None
+        self.ItemsSource = None
+        self.IsChecked = False
+        self.IsEnabled = True
+        self.Title = ''
+
+    def Clear(self):
+        self.Text = ''
+
+
+class _Dispatcher(object):
+    def Invoke(self, action):
+        return action()
+
+
+class Window(Control):
+    def _set_defaults(self):
+        Control._set_defaults(self)
+        self.Dispatcher = _Dispatcher()
+        self.IsLoaded = False
+        self.IsVisible = False
+        self.WindowState = WindowState.Normal
+        self.Closed = _Handlers()
+
+    def Show(self):
+        self.IsLoaded = True
+        self.IsVisible = True
+
+    def Activate(self):
+        return True
+
+    def Close(self):
+        self.IsLoaded = False
+        self.IsVisible = False
+        for handler in self.Closed:
+            handler(self, None)
+
+
+class _Handlers(list):
+    def __iadd__(self, handler):
+        self.append(handler)
+        return self
+
+
+class WindowState(object):
+    Normal = 'Normal'
+    Minimized = 'Minimized'
+    Maximized = 'Maximized'
+
+
+class Thickness(object):
+    def __init__(self, *values):
+        self.values = values
+
+
+class VerticalAlignment(object):
+    Center = 'Center'
+    Top = 'Top'
+    Bottom = 'Bottom'
+
+
+class Orientation(object):
+    Horizontal = 'Horizontal'
+    Vertical = 'Vertical'
+
+
+class Dock(object):
+    Left = 'Left'
+    Right = 'Right'
+
+
+class StackPanel(Control):
+    pass
+
+
+class ComboBox(Control):
+    pass
+
+
+class TextBox(Control):
+    pass
+
+
+class CheckBox(Control):
+    pass
+
+
+class DockPanel(Control):
+    @staticmethod
+    def SetDock(element, dock):
+        element.Dock = dock
+
+
+class MessageBoxButton(object):
+    OK = 'OK'
+
+
+class MessageBoxImage(object):
+    Information = 'Information'
+
+
+class MessageBox(object):
+    shown = []
+
+    @staticmethod
+    def Show(*args):
+        MessageBox.shown.append(args)
+
+
+# --- pyRevit's wpf module ---
+
+_NAME_RE = re.compile(r'x:Name="([^"]+)"')
+
+
+def LoadComponent(target, xaml_path):
+    """Creates a Control attribute for every x:Name in the XAML file."""
+    with open(xaml_path, 'r') as f:
+        for name in _NAME_RE.findall(f.read()):
+            setattr(target, name, Control())
+    return target
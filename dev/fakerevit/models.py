@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic model generators for the fake Revit document.
+
+Every generator returns (doc, info) where info holds the element lists a
+benchmark needs for its selection or setup.
+"""
+
+import math
+
+from .architecture import Room
+from .db import (
+    BoundarySegment, BuiltInCategory, BuiltInParameter, Document, Element,
+    ElementType, FamilyInstance, FamilySymbol, Level, Line, LocationCurve,
+    MEPCurve, ModelCurve, StorageType, View, ViewType, XYZ,
+)
+
+TRADE_SIZES = ['1/2"', '3/4"', '1"', '1 1/4"', '1 1/2"', '2"']
+BEND_ANGLES = [22.5, 45.0, 90.0]
+ROOM_PARAMETERS = [
+    ('Name', BuiltInParameter.ROOM_NAME, StorageType.String),
+    ('Number', BuiltInParameter.ROOM_NUMBER, StorageType.String),
+    ('Comments', BuiltInParameter.ALL_MODEL_INSTANCE_COMMENTS, StorageType.String),
+    ('Department', None, StorageType.String),
+    ('Occupancy', None, StorageType.String),
+    ('Base Finish', None, StorageType.String),
+    ('Ceiling Finish', None, StorageType.String),
+    ('Occupant Load', None, StorageType.Integer),
+    ('Design Airflow', None, StorageType.Double),
+]
+
+
+def _plan(doc, name='Level 1'):
+    level = doc.add(Level(name))
+    view = doc.add(View('{} - Floor Plan'.format(name), ViewType.FloorPlan, level))
+    phase = doc.add(Element(name='New Construction'))
+    view.add_parameter('Phase', phase.Id, builtin=BuiltInParameter.VIEW_PHASE)
+    doc.ActiveView = view
+    return level, view
+
+
+def build_view_model(count):
+    """count generic model elements visible in one floor plan."""
+    doc = Document('Isolate {}.rvt'.format(count))
+    _plan(doc)
+    elements = []
+    for i in range(count):
+        element = doc.add(Element(BuiltInCategory.OST_GenericModel, 'Generic {}'.format(i)))
+        elements.append(element)
+    return doc, {'elements': elements}
+
+
+def build_parameter_model(count, params_per_element=20):
+    """count elements carrying params_per_element string/double/integer parameters."""
+    doc = Document('Parameters {}.rvt'.format(count))
+    _plan(doc)
+    elements = []
+    for i in range(count):
+        element = doc.add(Element(BuiltInCategory.OST_GenericModel))
+        for p in range(params_per_element):
+            kind = p % 3
+            if kind == 0:
+                element.add_parameter('Text {}'.format(p), 'value {}'.format(i))
+            elif kind == 1:
+                element.add_parameter('Length {}'.format(p), float(i))
+            else:
+                element.add_parameter('Count {}'.format(p), i, read_only=(p % 5 == 0))
+        elements.append(element)
+    return doc, {'elements': elements, 'text_params': ['Text {}'.format(p) for p in range(0, params_per_element, 3)]}
+
+
+def _conduit_type(doc, name):
+    conduit_type = ElementType(BuiltInCategory.OST_Conduit, name)
+    conduit_type.add_parameter('Type Name', name, builtin=BuiltInParameter.ALL_MODEL_TYPE_NAME, read_only=True)
+    conduit_type.add_parameter('Family Name', 'Conduit with Fittings', builtin=BuiltInParameter.ALL_MODEL_FAMILY_NAME, read_only=True)
+    return doc.add(conduit_type)
+
+
+def _fitting_type(doc, family, name, radius_on_type):
+    fitting_type = FamilySymbol(BuiltInCategory.OST_ConduitFitting, name)
+    fitting_type.add_parameter('Type Name', name, builtin=BuiltInParameter.ALL_MODEL_TYPE_NAME, read_only=True)
+    fitting_type.add_parameter('Family Name', family, builtin=BuiltInParameter.ALL_MODEL_FAMILY_NAME, read_only=True)
+    if radius_on_type:
+        fitting_type.add_parameter('Bend Radius', 1.0)
+    return doc.add(fitting_type)
+
+
+def build_conduit_model(count, fitting_types=12):
+    """
+    count conduits and count fittings. Half of the fitting types keep their
+    radius on the type, the other half on each instance.
+    """
+    doc = Document('Conduits {}.rvt'.format(count))
+    _plan(doc)
+    conduit_types = [_conduit_type(doc, name) for name in ('EMT', 'RMC', 'PVC Sch 40')]
+    types = []
+    for i in range(fitting_types):
+        family = 'Conduit Elbow - {}'.format(['EMT', 'RMC', 'PVC'][i % 3])
+        types.append(_fitting_type(doc, family, 'Standard {}'.format(i), radius_on_type=(i % 2 == 0)))
+
+    conduits = []
+    fittings = []
+    for i in range(count):
+        size = TRADE_SIZES[i % len(TRADE_SIZES)]
+        conduit = MEPCurve(BuiltInCategory.OST_Conduit)
+        conduit._type_id = conduit_types[i % len(conduit_types)].Id
+        start = XYZ(i * 2.0, 0, 0)
+        conduit.Location = LocationCurve(Line.CreateBound(start, start + XYZ(1.5, 0, 0)))
+        conduit.add_parameter('Length', 1.5, builtin=BuiltInParameter.CURVE_ELEM_LENGTH, read_only=True)
+        conduit.add_parameter('Diameter(Trade Size)', (i % len(TRADE_SIZES) + 1) / 24.0,
+                              builtin=BuiltInParameter.RBS_CONDUIT_DIAMETER_PARAM)
+        conduit.add_parameter('Size', size, builtin=BuiltInParameter.RBS_CALCULATED_SIZE, read_only=True)
+        conduits.append(doc.add(conduit))
+
+        fitting_type = types[i % len(types)]
+        fitting = FamilyInstance(BuiltInCategory.OST_ConduitFitting)
+        fitting._type_id = fitting_type.Id
+        fitting.add_parameter('Size', u'{0}ø-{0}ø'.format(size),
+                              builtin=BuiltInParameter.RBS_CALCULATED_SIZE, read_only=True)
+        fitting.add_parameter('Angle', math.radians(BEND_ANGLES[i % len(BEND_ANGLES)]))
+        if fitting_type.LookupParameter('Bend Radius') is None:
+            fitting.add_parameter('Bend Radius', 1.0, builtin=BuiltInParameter.RBS_CONDUIT_BENDRADIUS)
+        fittings.append(doc.add(fitting))
+
+    return doc, {'conduit_types': conduit_types, 'fitting_types': types,
+                 'conduits': conduits, 'fittings': fittings}
+
+
+def build_room_model(count, room_size=10.0, splits=2):
+    """
+    count rooms on a square grid. Each side of a room boundary is split into
+    `splits` collinear segments so the merging logic has work to do. One
+    standalone room separator is added for every ten rooms.
+    """
+    doc = Document('Rooms {}.rvt'.format(count))
+    doc.room_parameter_names = ROOM_PARAMETERS
+    level, view = _plan(doc)
+    columns = max(1, int(math.ceil(math.sqrt(count))))
+    rooms = []
+    for i in range(count):
+        x0 = (i % columns) * room_size
+        y0 = (i // columns) * room_size
+        corners = [XYZ(x0, y0), XYZ(x0 + room_size, y0), XYZ(x0 + room_size, y0 + room_size), XYZ(x0, y0 + room_size)]
+        loop = []
+        for c in range(4):
+            start, end = corners[c], corners[(c + 1) % 4]
+            step = (end - start).Multiply(1.0 / splits)
+            for s in range(splits):
+                a = start + step.Multiply(s)
+                loop.append(BoundarySegment(Line.CreateBound(a, a + step)))
+        room = Room(level, XYZ(x0 + room_size / 2, y0 + room_size / 2), area=room_size * room_size)
+        room.boundary = [loop]
+        doc.add(room)
+        for name, builtin, storage in ROOM_PARAMETERS:
+            if storage is StorageType.String:
+                value = '{} {}'.format(name, i)
+            elif storage is StorageType.Integer:
+                value = i % 50
+            else:
+                value = float(i)
+            room.add_parameter(name, value, storage, builtin)
+        rooms.append(room)
+
+    separators = []
+    for i in range(count // 10):
+        x = (i % columns) * room_size + room_size / 2
+        y = (i // columns) * room_size
+        separator = ModelCurve(BuiltInCategory.OST_RoomSeparationLines)
+        separator.Location = LocationCurve(Line.CreateBound(XYZ(x, y), XYZ(x, y + room_size)))
+        separator.OwnerViewId = view.Id
+        separators.append(doc.add(separator))
+
+    return doc, {'rooms': rooms, 'separators': separators, 'level': level, 'view': view}
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Stand-in for the parts of pyRevit the scripts use: revit, forms, script and
+EXEC_PARAMS. Dialog answers can be scripted through forms.responses.
+"""
+
+import os
+import tempfile
+
+
+class ScriptExit(SystemExit):
+    pass
+
+
+# --- pyrevit.revit ---
+
+class _Selection(object):
+    def __init__(self, elements):
+        self._elements = elements
+
+    def __iter__(self):
+        return iter(self._elements)
+
+    def __len__(self):
+        return len(self._elements)
+
+    @property
+    def is_empty(self):
+        return not self._elements
+
+    @property
+    def elements(self):
+        return list(self._elements)
+
+    @property
+    def element_ids(self):
+        return [e.Id for e in self._elements]
+
+    @property
+    def first(self):
+        return self._elements[0] if self._elements else None
+
+
+class RevitModule(object):
+    """pyrevit.revit: doc/uidoc/active_view follow the loaded fake model."""
+
+    def __init__(self, db):
+        self._db = db
+        self.uidoc = None
+
+    @property
+    def doc(self):
+        return self.uidoc.Document
+
+    @property
+    def active_view(self):
+        return self.doc.ActiveView
+
+    def get_selection(self):
+        doc = self.doc
+        return _Selection([doc.GetElement(i) for i in self.uidoc.Selection.GetElementIds()])
+
+    def Transaction(self, name=None, doc=None, **kwargs):
+        return _RevitTransaction(self._db, doc or self.doc, name)
+
+
+class _RevitTransaction(object):
+    def __init__(self, db, doc, name):
+        self._transaction = db.Transaction(doc, name)
+
+    def __enter__(self):
+        self._transaction.Start()
+        return self._transaction
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_type is None:
+            self._transaction.Commit()
+        else:
+            self._transaction.RollBack()
+        return False
+
+
+# --- pyrevit.forms ---
+
+class FormsModule(object):
+    """
+    pyrevit.forms. responses maps a dialog name ('alert', 'ask_for_string',
+    'SelectFromList') to a value or a callable taking the dialog arguments.
+    Without a response, alerts answer yes, prompts return their default and
+    lists return their first item.
+    """
+
+    def __init__(self):
+        self.responses = {}
+        self.alerts = []
+        self.SelectFromList = _SelectFromList(self)
+        self.CommandSwitchWindow = _CommandSwitchWindow(self)
+
+    def _answer(self, dialog, fallback, *args, **kwargs):
+        response = self.responses.get(dialog, fallback)
+        if callable(response):
+            return response(*args, **kwargs)
+        return response
+
+    def alert(self, msg, title=None, yes=False, no=False, exitscript=False, **kwargs):
+        self.alerts.append(msg)
+        if exitscript:
+            raise ScriptExit(msg)
+        if yes or no:
+            return self._answer('alert', True, msg)
+        return True
+
+    def ask_for_string(self, default=None, prompt=None, title=None, **kwargs):
+        return self._answer('ask_for_string', default, default=default, prompt=prompt)
+
+    def save_file(self, file_ext='', default_name=None, **kwargs):
+        return self._answer('save_file', None, file_ext=file_ext, default_name=default_name)
+
+    def pick_file(self, file_ext='*', **kwargs):
+        return self._answer('pick_file', None, file_ext=file_ext)
+
+    def pick_folder(self, title=None, **kwargs):
+        return self._answer('pick_folder', None)
+
+
+class _SelectFromList(object):
+    def __init__(self, forms):
+        self._forms = forms
+
+    def show(self, context, title=None, button_name=None, multiselect=False, **kwargs):
+        items = list(context)
+        default = (items[:1] if multiselect else items[0]) if items else None
+        return self._forms._answer('SelectFromList', default, items)
+
+
+class _CommandSwitchWindow(object):
+    def __init__(self, forms):
+        self._forms = forms
+
+    def show(self, context, message=None, **kwargs):
+        items = list(context)
+        return self._forms._answer('CommandSwitchWindow', items[0] if items else None, items)
+
+
+# --- pyrevit.script ---
+
+class _Output(object):
+    def __init__(self):
+        self.lines = []
+
+    def print_md(self, text):
+        self.lines.append(text)
+
+    def print_table(self, table_data, columns=None, title=None, **kwargs):
+        self.lines.append((title, columns, table_data))
+
+    def linkify(self, element_ids, title=None):
+        return title or ''
+
+    def set_title(self, title):
+        pass
+
+
+class ScriptModule(object):
+    def __init__(self):
+        self.data = {}
+        self.output = _Output()
+
+    def exit(self):
+        raise ScriptExit()
+
+    def store_data(self, slot_name, data, this_project=True):
+        self.data[slot_name] = data
+
+    def load_data(self, slot_name, this_project=True):
+        if slot_name not in self.data:
+            raise IOError("No data stored for '{}'.".format(slot_name))
+        return self.data[slot_name]
+
+    def get_output(self):
+        return self.output
+
+    def get_universal_data_file(self, file_id, file_ext, add_cmd_name=False):
+        return os.path.join(tempfile.gettempdir(), 'pyRevit_{}.{}'.format(file_id, file_ext))
+
+
+class ExecParams(object):
+    def __init__(self):
+        self.config_mode = False
+        self.command_name = None
+        self.command_path = None
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Stand-in for Autodesk.Revit.UI: a UI application/document pair and
+external events that run their handler as soon as they are raised.
+"""
+
+
+class IExternalEventHandler(object):
+    def Execute(self, app):
+        raise NotImplementedError
+
+    def GetName(self):
+        return self.__class__.__name__
+
+
+class Selection(object):
+    def __init__(self):
+        self._ids = []
+
+    def GetElementIds(self):
+        return list(self._ids)
+
+    def SetElementIds(self, ids):
+        self._ids = list(ids)
+
+
+class UIDocument(object):
+    def __init__(self, doc):
+        self.Document = doc
+        self.Selection = Selection()
+
+    @property
+    def ActiveView(self):
+        return self.Document.ActiveView
+
+
+class UIApplication(object):
+    def __init__(self, uidoc):
+        self.ActiveUIDocument = uidoc
+        self.Application = uidoc.Document.Application
+
+
+class ExternalEvent(object):
+    # The UIApplication handed to handlers; set by fakerevit.load().
+    application = None
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.raise_count = 0
+
+    @staticmethod
+    def Create(handler):
+        return ExternalEvent(handler)
+
+    def Raise(self):
+        self.raise_count += 1
+        self.handler.Execute(ExternalEvent.application)
+
+    def Dispose(self):
+        pass
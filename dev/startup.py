@@ -0,0 +1,171 @@
+"""
+Cold vs warm click-to-ready latency per AATools button.
+
+    python dev/startup.py                      # offline, on the fakerevit stand-in
+    python dev/startup.py -w 5 -s 2000
+    python dev/startup.py --log "%APPDATA%/pyRevit/aatools_perf.jsonl"
+
+Offline, every button is clicked once after a session reset (cold) and then
+warm times. Profiling is switched on so the scripts' own instrument.ready()
+marks are used; buttons that never wait for the user report their total run
+time instead. Warm offline clicks keep the aatools modules imported, which
+pyRevit only does for persistent-engine buttons, so treat them as a lower
+bound. With --log the same table is built from the records written inside
+Revit while instrumentation.json is enabled.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench import (BEND_50, ISOLATE, PARAMETER_EDITOR, QUANTITIES,  # noqa: E402
+                   ROOMS_TO_MODEL, SET_TYPES, TYPES_APPLY)
+from fakerevit import install, models  # noqa: E402
+
+
+# --- Buttons ---
+# Each entry prepares the model for `size` elements; the script is then clicked.
+
+def setup_isolate(fake, size):
+    doc, info = models.build_view_model(size)
+    fake.load(doc, info['elements'][:max(1, size // 10)])
+
+
+def setup_rooms_to_model(fake, size):
+    doc, _info = models.build_room_model(max(1, size // 10))
+    fake.load(doc)
+    fake.forms.responses['ask_for_string'] = None
+
+
+def setup_conduits(fake, size):
+    doc, info = models.build_conduit_model(size // 2)
+    fake.load(doc)
+    return info
+
+
+def setup_types_apply(fake, size):
+    info = setup_conduits(fake, size)
+    # Two presets, so the button has to ask which one to apply.
+    for name in ('Preset A', 'Preset B'):
+        fake.forms.responses['ask_for_string'] = name
+        fake.run_script(SET_TYPES)
+    del fake.forms.responses['ask_for_string']
+    fake.select(info['conduits'] + info['fittings'])
+
+
+def setup_bend_50(fake, size):
+    info = setup_conduits(fake, size)
+    fake.select(info['fittings'])
+
+
+def setup_bend_50_model(fake, size):
+    setup_conduits(fake, size)
+    fake.forms.responses['alert'] = False
+
+
+def setup_parameter_editor(fake, size):
+    doc, info = models.build_parameter_model(size)
+    fake.load(doc, info['elements'])
+
+
+BUTTONS = [
+    ('Isolate', ISOLATE, setup_isolate),
+    ('Rooms to model', ROOMS_TO_MODEL, setup_rooms_to_model),
+    ('Set Types', SET_TYPES, setup_conduits),
+    ('Types Apply', TYPES_APPLY, setup_types_apply),
+    ('Bend 50', BEND_50, setup_bend_50),
+    ('Bend 50 (model)', BEND_50, setup_bend_50_model),
+    ('Quantities', QUANTITIES, setup_conduits),
+    ('Change parameters', PARAMETER_EDITOR, setup_parameter_editor),
+]
+
+
+# --- Log records ---
+
+def click_latencies(records):
+    """Groups the records of a perf log into {script: {'cold': [s], 'warm': [s]}}."""
+    clicks = {}
+    latencies = {}
+    for record in records:
+        # Logs written before run ids existed fall back to the finish() timestamp.
+        key = (record['script'], record.get('run') or record['time'])
+        if record['phase'] == 'ready' or (record['phase'] == 'total' and key not in clicks):
+            clicks[key] = (bool(record.get('cold')), record['duration'])
+    for (script_name, _run), (cold, duration) in sorted(clicks.items()):
+        by_kind = latencies.setdefault(script_name, {'cold': [], 'warm': []})
+        by_kind['cold' if cold else 'warm'].append(duration)
+    return latencies
+
+
+def read_log(path):
+    with open(path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# --- Offline clicks ---
+
+def click_offline(size, warm_clicks):
+    fake = install()
+    log_dir = tempfile.mkdtemp(prefix='aatools_startup_')
+    saved_env = dict((k, os.environ.get(k)) for k in ('APPDATA', 'AATOOLS_PROFILE'))
+    os.environ['APPDATA'] = log_dir
+    os.environ['AATOOLS_PROFILE'] = '1'
+    try:
+        latencies = {}
+        for label, path, setup in BUTTONS:
+            fake.reset_session()
+            setup(fake, size)
+            log_path = os.path.join(log_dir, 'pyRevit', 'aatools_perf.jsonl')
+            if os.path.exists(log_path):
+                os.remove(log_path)
+            for _ in range(1 + warm_clicks):
+                fake.run_script(path)
+            runs = click_latencies(read_log(log_path))
+            if runs:
+                latencies[label] = runs.popitem()[1]
+        return latencies
+    finally:
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+
+def print_table(latencies):
+    print('{:<24} {:>10} {:>12} {:>8}'.format('button', 'cold ms', 'warm ms', 'warm n'))
+    for label in sorted(latencies):
+        cold = latencies[label]['cold']
+        warm = latencies[label]['warm']
+        print('{:<24} {:>10} {:>12} {:>8}'.format(
+            label,
+            '{:.1f}'.format(statistics.median(cold) * 1000) if cold else '-',
+            '{:.1f}'.format(statistics.median(warm) * 1000) if warm else '-',
+            len(warm)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-s', '--size', type=int, default=1000)
+    parser.add_argument('-w', '--warm', type=int, default=3, help='warm clicks per button')
+    parser.add_argument('--log', help='summarize a perf log written inside Revit instead')
+    args = parser.parse_args(argv)
+
+    if args.log:
+        print_table(click_latencies(read_log(args.log)))
+    else:
+        print_table(click_offline(args.size, args.warm))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Runs every bench case once and checks its result.
+
+    python -m pytest dev
+    python -m pytest dev -k benchmark     # timings, needs pytest-benchmark
+
+Each case mutates its model, so a benchmark round is a single prepared run.
+"""
+
+import pytest
+
+import bench
+from fakerevit import install
+
+CHECK_SIZE = 100
+BENCHMARK_SIZE = 1000
+
+
+@pytest.fixture
+def fake():
+    return install()
+
+
+@pytest.mark.parametrize('case', sorted(bench.CASES))
+def test_case(fake, case):
+    run, check = bench.prepare(fake, case, CHECK_SIZE)
+    run()
+    check()
+
+
+@pytest.mark.parametrize('case', sorted(bench.CASES))
+def test_benchmark(fake, case, request):
+    pytest.importorskip('pytest_benchmark')
+    benchmark = request.getfixturevalue('benchmark')
+    run, check = bench.prepare(fake, case, BENCHMARK_SIZE)
+    benchmark.pedantic(run, rounds=1, iterations=1)
+    check()
+
+
+def test_script_exit_is_recorded(fake):
+    run, _check = bench.prepare(fake, 'types_apply', CHECK_SIZE)
+    fake.select([])
+    run()
+    assert fake.forms.alerts == ['No elements are selected. Please select conduits and fittings to change.']
+    assert str(fake.last_exit) == fake.forms.alerts[0]
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Behavior of the headless plan builder (room_batch) on JSON and snapshot inputs.
+
+    python -m pytest dev
+
+Runs stay in-process (workers=1); the worker pool only changes where the
+same _plan_job calls happen.
+"""
+
+import io
+import json
+import sys
+
+from fakerevit import LIB_DIR
+
+if LIB_DIR not in sys.path:
+    sys.path.insert(0, LIB_DIR)
+
+from aatools import room_batch, room_geometry, room_snapshot  # noqa: E402
+
+from test_room_geometry import square_loop, two_room_floor  # noqa: E402
+
+OFFSET = (0.0, 10.0, 0.0)
+
+
+def second_floor():
+    return {'floor': 'Level 2', 'document': 'C:/Models/A.rvt', 'view_id': 124,
+            'rooms': [{'id': 500, 'point': (5.0, 5.0, 10.0), 'loops': [square_loop(0.0, 0.0, 10.0, splits=2)]}],
+            'separators': []}
+
+
+def write_json(path, data):
+    with open(str(path), 'w') as f:
+        json.dump(data, f)
+    return str(path)
+
+
+def run_plans(paths, offset=OFFSET, previous=None):
+    """Returns (plan lines, floors written, floors reused)."""
+    output = io.StringIO()
+    count, reused = room_batch.run(paths, output, offset, workers=1, previous=previous)
+    return output.getvalue().splitlines(), count, reused
+
+
+def without_source(line):
+    plan = json.loads(line)
+    del plan['source_file'], plan['source_hash']
+    return plan
+
+
+def test_json_and_snapshot_inputs_give_identical_plans(tmp_path):
+    floor = two_room_floor()
+    json_path = write_json(tmp_path / 'level1.json', floor)
+    snapshot_path = str(tmp_path / ('level1' + room_snapshot.FILE_EXTENSION))
+    room_snapshot.write_snapshot(snapshot_path, floor)
+
+    from_json, _count, _reused = run_plans([json_path])
+    from_snapshot, _count, _reused = run_plans([snapshot_path])
+
+    assert len(from_json) == len(from_snapshot) == 1
+    assert without_source(from_json[0]) == without_source(from_snapshot[0])
+    expected = json.loads(json.dumps(room_geometry.build_plan(floor, OFFSET)))
+    assert without_source(from_json[0]) == expected
+
+
+def test_plans_follow_input_order_and_name_their_source(tmp_path):
+    ndjson_path = str(tmp_path / 'floors.ndjson')
+    with open(ndjson_path, 'w') as f:
+        for floor in (two_room_floor(), second_floor()):
+            room_geometry.write_ndjson(f, floor)
+    snapshot_path = str(tmp_path / ('level1' + room_snapshot.FILE_EXTENSION))
+    digest, _written = room_snapshot.write_snapshot(snapshot_path, two_room_floor())
+
+    lines, count, reused = run_plans([ndjson_path, snapshot_path])
+
+    plans = [json.loads(line) for line in lines]
+    assert (count, reused) == (3, 0)
+    assert [p['floor'] for p in plans] == ['Level 1', 'Level 2', 'Level 1']
+    assert [p['source_file'] for p in plans] == [ndjson_path, ndjson_path, snapshot_path]
+    assert plans[2]['source_hash'] == digest
+    assert plans[0]['source_hash'] != plans[1]['source_hash']
+
+
+def test_previous_plans_are_copied_for_unchanged_floors(tmp_path):
+    first = write_json(tmp_path / 'level1.json', two_room_floor())
+    second = write_json(tmp_path / 'level2.json', second_floor())
+    previous_path = tmp_path / 'plans.ndjson'
+    lines, _count, _reused = run_plans([first, second])
+    previous_path.write_text(u'\n'.join(lines) + u'\n')
+
+    changed = second_floor()
+    changed['rooms'][0]['point'] = (6.0, 5.0, 10.0)
+    write_json(tmp_path / 'level2.json', changed)
+    previous = room_batch.PreviousPlans(str(previous_path))
+    try:
+        new_lines, count, reused = run_plans([first, second], previous=previous)
+        moved_lines, _count, moved_reused = run_plans([first], offset=(0.0, 20.0, 0.0), previous=previous)
+    finally:
+        previous.close()
+
+    assert (count, reused) == (2, 1)
+    assert new_lines[0] == lines[0]
+    assert json.loads(new_lines[1])['rooms'][0]['point'] == [6.0, 15.0, 10.0]
+    # The same floor with another offset is a different plan.
+    assert moved_reused == 0
+    assert json.loads(moved_lines[0])['offset'] == [0.0, 20.0, 0.0]
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Behavior of the Revit-independent room boundary core (room_geometry).
+
+    python -m pytest dev
+"""
+
+import sys
+
+from fakerevit import LIB_DIR
+
+if LIB_DIR not in sys.path:
+    sys.path.insert(0, LIB_DIR)
+
+from aatools import room_geometry  # noqa: E402
+from aatools.room_geometry import ARC, LINE, make_line  # noqa: E402
+
+
+def square_loop(x0, y0, size, splits=1):
+    """Counter-clockwise square starting at (x0, y0), each side cut into splits lines."""
+    corners = [(x0, y0, 0.0), (x0 + size, y0, 0.0), (x0 + size, y0 + size, 0.0), (x0, y0 + size, 0.0)]
+    loop = []
+    for c in range(4):
+        start, end = corners[c], corners[(c + 1) % 4]
+        for s in range(splits):
+            a = tuple(start[i] + (end[i] - start[i]) * s / float(splits) for i in range(3))
+            b = tuple(start[i] + (end[i] - start[i]) * (s + 1) / float(splits) for i in range(3))
+            loop.append(make_line(a, b))
+    return loop
+
+
+def two_room_floor():
+    """Two 10 ft rooms side by side, sides split in three, plus standalone separators."""
+    return {
+        'floor': 'Level 1', 'document': 'C:/Models/A.rvt', 'view_id': 123,
+        'rooms': [
+            {'id': 456, 'point': (5.0, 5.0, 0.0), 'loops': [square_loop(0.0, 0.0, 10.0, splits=3)]},
+            {'id': 457, 'point': (15.0, 5.0, 0.0), 'loops': [square_loop(10.0, 0.0, 10.0, splits=3)]},
+        ],
+        'separators': [
+            # The shared wall, drawn in the other direction: already covered.
+            dict(make_line((10.0, 10.0, 0.0), (10.0, 0.0, 0.0)), source_id=900),
+            dict(make_line((5.0, 0.0, 0.0), (5.0, 10.0, 0.0)), source_id=901),
+            # Arc separators are not copied.
+            {'kind': ARC, 'points': [(0.0, 0.0, 0.0), (0.0, 4.0, 0.0), (-2.0, 2.0, 0.0)], 'source_id': 902},
+        ],
+    }
+
+
+def endpoints(curve):
+    return [tuple(round(v, 9) for v in p) for p in curve['points']]
+
+
+# --- merge_collinear_lines ---
+
+def test_merge_joins_split_sides_of_a_loop():
+    merged = room_geometry.merge_collinear_lines(square_loop(0.0, 0.0, 10.0, splits=4))
+    assert [endpoints(c) for c in merged] == [
+        [(0.0, 0.0, 0.0), (10.0, 0.0, 0.0)],
+        [(10.0, 0.0, 0.0), (10.0, 10.0, 0.0)],
+        [(10.0, 10.0, 0.0), (0.0, 10.0, 0.0)],
+        [(0.0, 10.0, 0.0), (0.0, 0.0, 0.0)],
+    ]
+
+
+def test_merge_stops_at_arcs_corners_and_gaps():
+    arc = {'kind': ARC, 'points': [(4.0, 0.0, 0.0), (6.0, 0.0, 0.0), (5.0, 1.0, 0.0)]}
+    curves = [
+        make_line((0.0, 0.0, 0.0), (2.0, 0.0, 0.0)),
+        make_line((2.0, 0.0, 0.0), (4.0, 0.0, 0.0)),
+        arc,
+        make_line((6.0, 0.0, 0.0), (8.0, 0.0, 0.0)),
+        make_line((8.5, 0.0, 0.0), (9.0, 0.0, 0.0)),     # collinear, but not touching
+        make_line((9.0, 0.0, 0.0), (9.0, 3.0, 0.0)),     # touching, but turning
+    ]
+    merged = room_geometry.merge_collinear_lines(curves)
+    assert [c['kind'] for c in merged] == [LINE, ARC, LINE, LINE, LINE]
+    assert endpoints(merged[0]) == [(0.0, 0.0, 0.0), (4.0, 0.0, 0.0)]
+    assert merged[1] is arc
+
+
+# --- line_fingerprint ---
+
+def test_fingerprint_ignores_direction_height_and_noise():
+    line = make_line((0.0, 0.0, 0.0), (10.0, 0.0, 0.0))
+    assert room_geometry.line_fingerprint(line) == room_geometry.line_fingerprint(
+        make_line((10.0000001, 0.0, 3.0), (0.0, -0.0000001, 3.0)))
+    assert room_geometry.line_fingerprint(line) != room_geometry.line_fingerprint(
+        make_line((0.0, 0.0, 0.0), (10.001, 0.0, 0.0)))
+
+
+# --- build_plan ---
+
+def test_plan_dedupes_room_boundaries_and_standalone_separators():
+    plan = room_geometry.build_plan(two_room_floor(), (0.0, 100.0, 0.0))
+
+    assert [r['source_id'] for r in plan['rooms']] == [456, 457]
+    assert plan['rooms'][0]['point'] == (5.0, 105.0, 0.0)
+    # 4 sides of the first room, 3 new ones of the second, then the mid-room separator.
+    assert [s.get('source_id') for s in plan['separators']] == [456] * 4 + [457] * 3 + [901]
+    fingerprints = [room_geometry.line_fingerprint(s) for s in plan['separators']]
+    assert len(set(fingerprints)) == len(fingerprints)
+    assert endpoints(plan['separators'][-1]) == [(5.0, 100.0, 0.0), (5.0, 110.0, 0.0)]
+
+
+def test_plan_keeps_floor_identity_and_offset():
+    plan = room_geometry.build_plan(two_room_floor(), [1.0, 2.0, 3.0])
+    assert (plan['floor'], plan['document'], plan['view_id']) == ('Level 1', 'C:/Models/A.rvt', 123)
+    assert plan['offset'] == [1.0, 2.0, 3.0]
+
+
+def test_plan_keeps_room_arcs_and_native_curves():
+    arc = {'kind': ARC, 'points': [(0.0, 0.0, 0.0), (0.0, 10.0, 0.0), (-5.0, 5.0, 0.0)]}
+    native = {'kind': room_geometry.NATIVE, 'ref': 7}
+    loop = [make_line((0.0, 10.0, 0.0), (0.0, 0.0, 0.0)), arc, native]
+    floor = {'rooms': [{'id': 1, 'point': (0.0, 5.0, 0.0), 'loops': [loop, loop]}]}
+
+    plan = room_geometry.build_plan(floor, (10.0, 0.0, 0.0))
+
+    # The repeated loop adds its line once but its arc and native curve again.
+    assert [s['kind'] for s in plan['separators']] == [LINE, ARC, room_geometry.NATIVE, ARC, room_geometry.NATIVE]
+    assert plan['separators'][1]['points'][2] == (5.0, 5.0, 0.0)
+    assert plan['separators'][2]['offset'] == (10.0, 0.0, 0.0)